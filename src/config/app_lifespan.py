@@ -2,12 +2,15 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from src.config.mod_settings import get_settings
 from src.mlogger import logger
+from src.services.http_pool import HttpClientPool
+from src.services.module_registry import ModuleRegistry
 from src.settings.base import get_bussiness_config
 
 
 @asynccontextmanager
-async def lifespan(app: FastAPI):  # noqa: D103, RUF029
+async def lifespan(app: FastAPI):  # noqa: D103
     logger.info("App started. Loading settings...")
     try:
         app.state.settings = get_bussiness_config()
@@ -15,5 +18,17 @@ async def lifespan(app: FastAPI):  # noqa: D103, RUF029
     except Exception as exc:
         logger.error(f"Failed to load settings: {exc}")
         raise
-    yield
-    logger.info("App stopped.")
+    modules = get_settings().modules
+    app.state.http_pool = HttpClientPool()
+    app.state.http_pool.start(modules)
+    app.state.module_registry = ModuleRegistry(
+        app.state.http_pool,
+        default_max_chars=app.state.settings.response_global.min_inbound_characters,
+        accounts=app.state.settings.accounts,
+    )
+    app.state.module_registry.start(modules)
+    try:
+        yield
+    finally:
+        await app.state.http_pool.aclose()
+        logger.info("App stopped.")
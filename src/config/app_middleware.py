@@ -1,12 +1,23 @@
-"""setup logger binding and cors middleware."""
+"""setup logger binding, metrics and cors middleware."""
 
-import uuid
+import re
+import time
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from src.mlogger import logger
+from src.metrics import REQUEST_DURATION, REQUESTS_IN_FLIGHT, HistogramChild
+from src.mlogger import (
+    bind_request_context,
+    logger,
+    new_request_id,
+    reset_request_context,
+)
+
+# X-Request-ID dari client dipakai kalau formatnya aman untuk log/header
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,64}")
 
 
 def setup_cors(app: FastAPI):
@@ -19,15 +30,91 @@ def setup_cors(app: FastAPI):
     )
 
 
+class RequestContextMiddleware:
+    """Pure ASGI middleware that sets the request id context for logging.
+
+    Request id diambil dari header `X-Request-ID` (kalau valid) atau dibuat
+    lewat `new_request_id()`, disimpan di contextvar (dibaca patcher loguru)
+    dan dikembalikan di header response. Tidak seperti `@app.middleware("http")`
+    tidak ada task/stream tambahan per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = self._incoming_request_id(scope) or new_request_id()
+        header = (b"x-request-id", request_id.encode("latin-1"))
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+
+        token = bind_request_context(request_id, scope.get("path", ""))
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            reset_request_context(token)
+
+    @staticmethod
+    def _incoming_request_id(scope: Scope) -> str | None:
+        for name, value in scope.get("headers", ()):
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                return candidate if _VALID_REQUEST_ID.fullmatch(candidate) else None
+        return None
+
+
 def setup_logger_binding(app: FastAPI):
-    @app.middleware("http")
-    async def add_logger_context(request: Request, call_next):
-        request_id = str(uuid.uuid4())
-        logger_ctx = logger.bind(request_id=request_id, path=request.url.path)
-        request.state.logger = logger_ctx
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
+    app.add_middleware(RequestContextMiddleware)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request latency and in-flight requests.
+
+    Label `path` memakai template route (bukan path mentah) supaya jumlah
+    series tetap kecil; child histogram di-cache per (path, method, status).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.in_flight = REQUESTS_IN_FLIGHT.labels()
+        self._children: dict[tuple[str, str, int], HistogramChild] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.in_flight.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            key = (path, scope["method"], status)
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = REQUEST_DURATION.labels(*key)
+            child.observe(time.perf_counter() - start)
+
+
+def setup_metrics(app: FastAPI):
+    """Register the request metrics middleware."""
+    app.add_middleware(MetricsMiddleware)
 
 
 def setup_exception_handler(app: FastAPI):
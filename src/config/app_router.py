@@ -2,8 +2,12 @@
 
 from fastapi import FastAPI
 
+from src.router.diagnostics import router as diagnostics_router
 from src.router.listpaket import router as listpaket_router
+from src.router.metrics import router as metrics_router
 
 
 def register_routers(app: FastAPI):
     app.include_router(listpaket_router)
+    app.include_router(diagnostics_router)
+    app.include_router(metrics_router)
@@ -2,6 +2,7 @@
 
 # ruff: noqa ARG003
 from functools import lru_cache
+from typing import Literal
 from pydantic import BaseModel
 from pydantic_settings import (
     BaseSettings,
@@ -14,14 +15,106 @@ from pydantic_settings import (
 class ModuleConfig(BaseModel):
     name: str
     base_url: str
+    # method upstream yang dideklarasikan; dikirim hanya kalau use_configured_method
+    # = true (default tetap GET seperti sebelumnya, supaya retry tetap berlaku)
     method: str = "GET"
+    use_configured_method: bool = False
     timeout: int
     max_retries: int
     seconds_between_retries: int
     replace_with_regex: bool
     list_regex_replacement: list[str] | None = None
+    # gabung semua regex jadi satu alternation (lihat QuotaPipeline)
+    fuse_regex_replacement: bool = False
     exclude_product: bool
     list_prefixes: list[str] | None = None
+    # rule exclusion tambahan (case-insensitive), aktif kalau exclude_product = true
+    list_suffixes: list[str] | None = None
+    list_contains: list[str] | None = None
+    list_exclude_regex: list[str] | None = None
+    # LRU memo hasil clean quota per processor (jumlah entry), 0 = nonaktif
+    quota_memo_size: int = 1024
+    # connection pool per module (httpx.AsyncClient dibuat sekali saat startup)
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    # retry policy: exponential backoff + jitter, dibatasi total deadline
+    backoff_max_seconds: float = 10.0
+    retry_jitter: bool = True
+    total_deadline_seconds: float | None = None
+    retry_on_status: list[int] = [408, 429, 500, 502, 503, 504]
+    # cache response upstream (TTL + LRU), 0 = nonaktif
+    cache_ttl_seconds: float = 0
+    cache_max_entries: int = 256
+    cache_exclude_params: list[str] = ["trxid"]
+    # opt-in, hanya untuk response cache (cache_ttl_seconds > 0): `to` di cache
+    # key cukup prefix nomor, jadi pelanggan dengan prefix sama berbagi catalog.
+    # None = nomor lengkap (cache per pelanggan); coalescing selalu nomor lengkap
+    cache_to_prefix_length: int | None = None
+    # simpan catalog yang sudah di-render per request key (juga dipakai pagination)
+    snapshot_cache: bool = True
+    # umur snapshot kalau cache_ttl_seconds = 0, supaya page 2..N tidak fetch ulang
+    page_cache_ttl_seconds: float = 120
+    # jumlah paket per halaman kalau request hanya mengirim `page`
+    default_page_size: int = 50
+    # request identik yang sedang jalan berbagi satu call upstream (single-flight)
+    coalesce_requests: bool = True
+    # sebar call upstream ke account aktif di secrets/config.toml [[accounts.<nama module>]]
+    use_accounts: bool = False
+    account_strategy: Literal["round_robin", "least_outstanding", "latency_ewma"] = (
+        "round_robin"
+    )
+    # circuit breaker per base_url: open kalau rasio gagal (error/5xx/429 atau
+    # lebih lambat dari breaker_slow_call_seconds) di `breaker_window` call
+    # terakhir >= breaker_error_rate; selama open request langsung 503
+    circuit_breaker: bool = False
+    breaker_window: int = 20
+    breaker_min_calls: int = 5
+    breaker_error_rate: float = 0.5
+    breaker_slow_call_seconds: float | None = None
+    breaker_open_seconds: float = 30.0
+    breaker_half_open_calls: int = 1
+    # hedged request (hanya `forward`, method idempotent): kalau call belum selesai
+    # setelah persentil hedge_percentile latency terakhir, kirim call kedua ke
+    # account lain dan pakai yang lebih dulu selesai; maks hedge_max_rate x request.
+    # Butuh use_accounts dengan >1 account aktif, tanpa itu tidak ada hedge
+    hedge_requests: bool = False
+    hedge_percentile: float = 95.0
+    hedge_min_delay_seconds: float = 0.05
+    hedge_max_rate: float = 0.1
+    hedge_window: int = 200
+    hedge_min_samples: int = 20
+    # admission control: maks call upstream bersamaan per module / per account
+    # (0 = tanpa batas); sisanya antre maks max_queue_size selama
+    # queue_timeout_seconds, lebih dari itu request langsung 503
+    max_concurrent_requests: int = 0
+    max_concurrent_per_account: int = 0
+    max_queue_size: int = 100
+    queue_timeout_seconds: float = 2.0
+    # parse body upstream secara streaming, item `paket` diproses satu per satu
+    # (paling efektif kalau cache_ttl_seconds = 0, cache butuh response utuh)
+    stream_parse: bool = False
+    # prefix `info=before:(...)after:(...)&` di response /listpaket
+    enable_stats: bool = True
+    # kirim message /listpaket sebagai StreamingResponse (chunk per `stream_chunk_chars`)
+    # tanpa membangun string utuh; tidak berlaku untuk pagination / message yang
+    # dipadatkan. Listing yang melebihi budget selalu dipadatkan/dipecah, jadi
+    # listing besar hanya di-stream kalau budget nonaktif (max_message_chars = 0)
+    stream_response: bool = False
+    stream_chunk_chars: int = 16384
+    # batas panjang message /listpaket; None = pakai response.min_inbound_characters
+    # dari secrets/config.toml, 0 = tanpa batas
+    max_message_chars: int | None = None
+    # kata -> singkatan untuk strategi "abbreviate"; None = DEFAULT_ABBREVIATIONS
+    budget_abbreviations: dict[str, str] | None = None
+    # kolom yang dikosongkan pada strategi "drop_columns"
+    budget_drop_columns: list[Literal["quota", "product_name"]] = ["quota"]
+
+    @property
+    def wire_method(self) -> str:
+        """HTTP method actually sent upstream."""
+        return self.method.upper() if self.use_configured_method else "GET"
 
 
 class ModuleSettings(BaseSettings):
@@ -1,39 +1,53 @@
 """dependencies for request forwarding and response processing."""
 
-from fastapi import Depends
-from src.config.mod_settings import ModuleConfig
-from src.dependencies.mod_depends import get_module_config
+from fastapi import Depends, HTTPException, Request
 from src.interfaces.ireq_forwarder import IRequestForwarder
 from src.interfaces.ireq_response import IResponseProcessor
 from src.mlogger import logger  # add logger import
-from src.services.req_forwarder import RequestForwarder
-from src.services.req_response import ResponseProcessor
+from src.services.module_registry import ModuleRegistry, ModuleServices
+
+
+def get_module_registry(request: Request) -> ModuleRegistry:
+    """Return the registry built by the app lifespan.
+
+    Registry hanya dibangun di lifespan (budget default, account pool, http
+    pool), jadi tidak ada fallback yang membangun registry dengan setting berbeda.
+
+    Raises:
+        HTTPException: If the lifespan has not set up the registry.
+    """
+    registry = getattr(request.app.state, "module_registry", None)
+    if registry is None:
+        logger.error("Module registry is not initialised, was the lifespan run?")
+        raise HTTPException(status_code=503, detail="Service not ready")
+    return registry
+
+
+def get_module_services(
+    mod: str,
+    registry: ModuleRegistry = Depends(get_module_registry),
+) -> ModuleServices:
+    """Dependency provider for the cached services of a module.
+
+    Raises:
+        HTTPException: If the module is not found.
+    """
+    services = registry.get(mod)
+    if services is None:
+        logger.error(f"Unknown module requested: '{mod}'")
+        raise HTTPException(status_code=400, detail="Unknown module")
+    return services
 
 
 def get_request_forwarder(
-    module_cfg: ModuleConfig = Depends(get_module_config),
+    services: ModuleServices = Depends(get_module_services),
 ) -> IRequestForwarder:
     """Dependency provider for IRequestForwarder, dynamic per module."""
-    logger.info(f"Creating RequestForwarder for base_url='{module_cfg.base_url}'")
-    return RequestForwarder(target_base_url=module_cfg.base_url)
+    return services.forwarder
 
 
 def get_response_processor(
-    module_cfg: ModuleConfig = Depends(get_module_config),
+    services: ModuleServices = Depends(get_module_services),
 ) -> IResponseProcessor:
     """Dependency provider for IResponseProcessor, dynamic per module."""
-    # Default values (jika ingin fallback)
-    default_regexs = [r"\b(DAYS?|HARI)\b", r"(\d+)\s*GB", r"(\d+)\s*D", r"\bINTERNET\b"]
-    logger.info(
-        "Creating ResponseProcessor with exclude_product={exclude_product}, list_prefixes={list_prefixes}, replace_with_regex={replace_with_regex}, list_regex_replacement={list_regex_replacement}",
-        exclude_product=module_cfg.exclude_product,
-        list_prefixes=module_cfg.list_prefixes,
-        replace_with_regex=module_cfg.replace_with_regex,
-        list_regex_replacement=module_cfg.list_regex_replacement or default_regexs,
-    )
-    return ResponseProcessor(
-        exclude_product=module_cfg.exclude_product,
-        list_prefixes=module_cfg.list_prefixes or [],
-        replace_with_regex=module_cfg.replace_with_regex,
-        list_regex_replacement=module_cfg.list_regex_replacement or default_regexs,
-    )
+    return services.processor
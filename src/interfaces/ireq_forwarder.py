@@ -1,4 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from typing import Any
+
+from src.schemas.upstream import ByteMeter
 
 
 class IRequestForwarder(ABC):
@@ -8,3 +12,23 @@ class IRequestForwarder(ABC):
 
     async def forward_get(self, endpoint: str, query_params: dict) -> dict:
         return await self.forward(endpoint, query_params)
+
+    async def stream_items(
+        self,
+        endpoint: str,
+        query_params: dict,
+        key: str = "paket",
+        meter: ByteMeter | None = None,
+    ) -> AsyncIterator[Any]:
+        """Yield the items of array `key` from the response, one at a time.
+
+        Default-nya ambil full response lewat `forward()`; forwarder yang bisa
+        parsing secara streaming meng-override method ini. `meter` diisi
+        jumlah byte body upstream.
+        """
+        resp = await self.forward(endpoint, query_params)
+        if meter is not None:
+            meter.bytes = getattr(resp, "raw_size", 0)
+        items = resp.get(key) if isinstance(resp, dict) else None
+        for item in items or []:
+            yield item
@@ -1,19 +1,53 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, Collection
+
+from src.schemas.catalog_snapshot import CatalogSnapshot
+from src.schemas.paket_record import PaketRecord
 
 
 class IResponseProcessor(ABC):
     @abstractmethod
-    def process(self, paket_list: list[dict]) -> list[dict]:
+    def process(
+        self, paket_list: list[dict], columns: Collection[str] | None = None
+    ) -> list[PaketRecord]:
+        """Return hasil proses; statistik before/after ada di atribut `stats`.
+
+        `columns` = proyeksi kolom (nama atribut PaketRecord), None = semua.
+        """
         pass
 
+    async def aprocess(
+        self,
+        paket_items: AsyncIterable[dict],
+        columns: Collection[str] | None = None,
+    ) -> list[PaketRecord]:
+        """Process paket dari async iterator (misal hasil streaming upstream)."""
+        return self.process([p async for p in paket_items], columns)
+
+    def build_snapshot(
+        self,
+        result: list[PaketRecord],
+        source: object = None,
+        raw_size: int | None = None,
+        columns: Collection[str] | None = None,
+    ) -> CatalogSnapshot:
+        """Render hasil proses sekali jadi snapshot yang bisa di-cache."""
+        return CatalogSnapshot(
+            result, source=source, raw_size=raw_size, columns=columns
+        )
+
+    def response_header(self, trxid: str, to: str, category: str = "paket") -> str:
+        """Bagian message sebelum daftar paket."""
+        return (
+            f"trxid={trxid}&to={to}&status=success&message=listpaket in {category} : "
+        )
+
     @abstractmethod
     def to_response_string(
-        self, result: list[dict], trxid: str, to: str, category: str
+        self,
+        result: list[PaketRecord] | CatalogSnapshot,
+        trxid: str,
+        to: str,
+        category: str,
     ) -> str:
         pass
-
-    # Tambahin ini
-    @abstractmethod
-    def get_stats(self) -> dict:
-        """Return info seperti total char dan produk sebelum/sesudah proses."""
-        pass
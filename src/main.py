@@ -10,10 +10,17 @@ from src.config.app_middleware import (
     setup_cors,
     setup_exception_handler,
     setup_logger_binding,
+    setup_metrics,
 )
 from src.config.app_router import register_routers
 from src.dependencies.mod_depends import get_settings
-from src.mlogger import LogConfig, LoggerManager, logger, parse_log_level
+from src.mlogger import (
+    LogConfig,
+    LoggerManager,
+    configure_payload_logging,
+    logger,
+    parse_log_level,
+)
 
 load_dotenv()
 log_level = os.getenv("APP_LOG_LEVEL", "INFO")
@@ -23,8 +30,13 @@ log_config = LogConfig(
     to_file=False,
     format_style="simple",
     bind_context={"app": "mod-parser"},
+    buffered=os.getenv("APP_LOG_BUFFERED", "false").lower() == "true",
 )
 LoggerManager(log_config).setup()
+configure_payload_logging(
+    max_chars=int(os.getenv("APP_LOG_PAYLOAD_MAX_CHARS", "2000")),
+    sample_rate=float(os.getenv("APP_LOG_PAYLOAD_SAMPLE_RATE", "1.0")),
+)
 logger.debug("Logger initialized with config", log_config=log_config)
 settings = get_settings()
 app = FastAPI(
@@ -38,6 +50,7 @@ app = FastAPI(
 
 setup_cors(app)
 setup_logger_binding(app)
+setup_metrics(app)
 setup_exception_handler(app)
 
 register_routers(app)
@@ -0,0 +1,251 @@
+"""Metrics in-process (counter, gauge, histogram) dengan output format text Prometheus.
+
+Label di-resolve sekali lewat `.labels(...)` dan child-nya disimpan oleh caller
+(pre-bound), jadi di hot path hanya ada `inc()` / `observe()` tanpa membuat
+dict label per request. Semua update terjadi di thread event loop.
+
+Example:
+    >>> from src.metrics import STAGE_DURATION
+    >>> # sekali saat startup
+    >>> process_timer = STAGE_DURATION.labels("digipos", "process")
+    >>> # per request
+    >>> process_timer.observe(0.012)
+"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _label_pairs(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class CounterChild:
+    __slots__ = ("labels", "value")
+
+    def __init__(self, labels: str):
+        self.labels = labels
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def samples(self, name: str) -> Iterator[str]:
+        labels = f"{{{self.labels}}}" if self.labels else ""
+        yield f"{name}{labels} {_format_value(self.value)}"
+
+
+class GaugeChild(CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class HistogramChild:
+    __slots__ = ("_bucket_labels", "bounds", "count", "counts", "labels", "sum")
+
+    def __init__(self, labels: str, bounds: tuple[float, ...]):
+        self.labels = labels
+        self.bounds = bounds
+        # counts[i] = observasi di bucket i (non-kumulatif), terakhir = +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        prefix = f"{labels}," if labels else ""
+        self._bucket_labels = [
+            f'{{{prefix}le="{_format_value(bound)}"}}'
+            for bound in (*bounds, float("inf"))
+        ]
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration (seconds) of the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def samples(self, name: str) -> Iterator[str]:
+        cumulative = 0
+        for bucket_labels, count in zip(self._bucket_labels, self.counts, strict=True):
+            cumulative += count
+            yield f"{name}_bucket{bucket_labels} {cumulative}"
+        labels = f"{{{self.labels}}}" if self.labels else ""
+        yield f"{name}_sum{labels} {_format_value(self.sum)}"
+        yield f"{name}_count{labels} {self.count}"
+
+
+class Metric:
+    """A named metric family; children are created once per label combination."""
+
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._children: dict[tuple[str, ...], CounterChild | HistogramChild] = {}
+
+    def labels(self, *values: object) -> CounterChild | GaugeChild | HistogramChild:
+        """Return the (cached) child for these label values; keep it, don't call per request."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {key}"
+                )
+            labels = _label_pairs(self.labelnames, key)
+            if self.kind == "histogram":
+                child = HistogramChild(labels, self.buckets)
+            elif self.kind == "gauge":
+                child = GaugeChild(labels)
+            else:
+                child = CounterChild(labels)
+            self._children[key] = child
+        return child
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for child in self._children.values():
+            yield from child.samples(self.name)
+
+
+class MetricsRegistry:
+    """Holds the metric families exported by `/metrics`."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def _get_or_create(self, kind: str, name: str, *args, **kwargs) -> Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Metric(kind, name, *args, **kwargs)
+        elif metric.kind != kind:
+            raise ValueError(f"Metric {name} already registered as {metric.kind}")
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Metric:
+        return self._get_or_create("counter", name, documentation, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Metric:
+        return self._get_or_create("gauge", name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Metric:
+        return self._get_or_create(
+            "histogram", name, documentation, labelnames, buckets=buckets
+        )
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+def render_samples(
+    name: str,
+    kind: str,
+    documentation: str,
+    samples: Iterable[tuple[Mapping[str, object], float]],
+) -> str:
+    """Render scrape-time samples (nilai dibaca dari stats objek lain saat /metrics)."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        pairs = _label_pairs(tuple(labels), tuple(str(v) for v in labels.values()))
+        lines.append(f"{name}{{{pairs}}} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "modparser_request_duration_seconds",
+    "HTTP request latency.",
+    ("path", "method", "status"),
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "modparser_requests_in_flight", "HTTP requests currently being served."
+)
+UPSTREAM_DURATION = REGISTRY.histogram(
+    "modparser_upstream_duration_seconds",
+    "Latency of one upstream attempt.",
+    ("module", "account", "outcome"),
+)
+UPSTREAM_RETRIES = REGISTRY.counter(
+    "modparser_upstream_retries_total", "Upstream attempts retried.", ("module",)
+)
+STAGE_DURATION = REGISTRY.histogram(
+    "modparser_stage_duration_seconds",
+    "Duration of a /listpaket stage (process, render).",
+    ("module", "stage"),
+)
+PAYLOAD_SIZE = REGISTRY.histogram(
+    "modparser_payload_size",
+    "Upstream body size (bytes) and response message size (chars).",
+    ("module", "direction"),
+    buckets=SIZE_BUCKETS,
+)
+
+
+class ModuleMetrics:
+    """Pre-bound metric children of one module, built once at startup."""
+
+    __slots__ = (
+        "process",
+        "render",
+        "response_size",
+        "stream_process",
+        "upstream_size",
+    )
+
+    def __init__(self, module: str):
+        self.process = STAGE_DURATION.labels(module, "process")
+        self.stream_process = STAGE_DURATION.labels(module, "stream_process")
+        self.render = STAGE_DURATION.labels(module, "render")
+        self.upstream_size = PAYLOAD_SIZE.labels(module, "upstream")
+        self.response_size = PAYLOAD_SIZE.labels(module, "response")
@@ -69,15 +69,21 @@ Author: Maki & ChatGPT
 """
 
 import asyncio
+import atexit
 import functools
 import inspect
+import itertools
 import logging
 import os
+import random
 import sys
+import threading
 import time
 import uuid
+from collections import deque
 from collections.abc import Callable, Iterator
 from contextlib import AbstractContextManager, contextmanager
+from contextvars import ContextVar, Token
 from dataclasses import dataclass
 from pathlib import Path
 from types import TracebackType
@@ -104,6 +110,107 @@ class LogConfig:
     format_style: Literal["simple", "full"] = "simple"
     bind_context: dict[str, Any] | None = None
     enable_exception_hooks: bool = True
+    # sink terminal lewat BufferedSink (ring buffer + batch write di thread terpisah)
+    # menggantikan enqueue; file sink tetap sink file loguru (butuh rotation)
+    buffered: bool = False
+    buffer_capacity: int = 10_000
+    buffer_batch_size: int = 256
+    buffer_flush_interval: float = 0.2
+    buffer_drop_policy: Literal["drop_oldest", "drop_newest"] = "drop_oldest"
+
+
+class BufferedSink:
+    """Non-blocking log sink: bounded in-memory ring buffer drained in batches.
+
+    `write()` hanya append ke buffer (tanpa pickling/IO di thread pemanggil);
+    thread background menulis isi buffer sekaligus setiap `flush_interval`
+    detik atau saat buffer mencapai `batch_size`. Kalau buffer penuh:
+    - drop_oldest: record paling lama dibuang (ring buffer)
+    - drop_newest: record baru dibuang
+    Jumlah record yang dibuang tercatat di `dropped`.
+    """
+
+    def __init__(
+        self,
+        stream: Any,
+        capacity: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 0.2,
+        drop_policy: Literal["drop_oldest", "drop_newest"] = "drop_oldest",
+    ):
+        if drop_policy not in ("drop_oldest", "drop_newest"):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.stream = stream
+        self.capacity = max(1, capacity)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.write_errors = 0
+        self._buffer: deque[str] = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="log-buffered-sink", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def write(self, message: str) -> None:
+        with self._lock:
+            if len(self._buffer) >= self.capacity:
+                self.dropped += 1
+                if self.drop_policy == "drop_newest":
+                    return
+                self._buffer.popleft()
+            self._buffer.append(message)
+            full_batch = len(self._buffer) >= self.batch_size
+        if full_batch:
+            self._wakeup.set()
+
+    def drain(self) -> None:
+        """Write everything currently buffered in a single batch."""
+        with self._lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, deque()
+        try:
+            self.stream.write("".join(batch))
+            if callable(getattr(self.stream, "flush", None)):
+                self.stream.flush()
+        except Exception:
+            self.write_errors += 1
+            return
+        self.written += len(batch)
+        self.batches += 1
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.drain()
+
+    def stop(self) -> None:
+        """Stop the writer thread and flush what is left (dipanggil loguru.remove)."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join(timeout=max(1.0, self.flush_interval * 5))
+        self.drain()
+        atexit.unregister(self.stop)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+        }
 
 
 class InterceptHandler(logging.Handler):
@@ -133,6 +240,7 @@ logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
 class LoggerManager:
     def __init__(self, config: LogConfig):
         self.config = config
+        self.buffered_sinks: list[BufferedSink] = []
         self.FORMAT_SIMPLE = "<level>{level}</level>: <magenta>{name}:{function}:{line}</magenta> | {message} | {extra}"
         self.FORMAT_FULL = (
             "<level>{level}</level>: {time:YYYY-MM-DD HH:mm:ss} | "
@@ -153,13 +261,13 @@ class LoggerManager:
 
         if self.config.to_terminal:
             logger_patched.add(
-                sink=sys.stderr,
+                sink=self._terminal_sink(),
                 level=self.config.level,
                 format=self._get_format(),
                 colorize=True,
                 backtrace=True,
                 diagnose=self.config.diagnose,
-                enqueue=self.config.enqueue,
+                enqueue=self.config.enqueue and not self.config.buffered,
                 serialize=self.config.serialize,
             )
         if self.config.to_file:
@@ -182,6 +290,19 @@ class LoggerManager:
             self._setup_exception_hooks()
         logger_patched.info("Logging initialized")
 
+    def _terminal_sink(self) -> Any:
+        if not self.config.buffered:
+            return sys.stderr
+        sink = BufferedSink(
+            sys.stderr,
+            capacity=self.config.buffer_capacity,
+            batch_size=self.config.buffer_batch_size,
+            flush_interval=self.config.buffer_flush_interval,
+            drop_policy=self.config.buffer_drop_policy,
+        )
+        self.buffered_sinks.append(sink)
+        return sink
+
     def _get_format(self) -> str:
         return (
             self.FORMAT_SIMPLE
@@ -488,6 +609,49 @@ def log_error(exc: Exception, msg: str = ""):
     loguru_logger.opt(exception=exc).error(msg or str(exc))
 
 
+# --- Request context (request id via contextvars, bukan logger.bind per request) ---
+
+_request_context: ContextVar[tuple[str, str] | None] = ContextVar(
+    "request_context", default=None
+)
+# prefix unik per proses + counter, jauh lebih murah dari uuid4 per request
+_REQUEST_ID_PREFIX = f"{os.getpid():x}{int(time.time()) & 0xFFFFFF:06x}"
+_request_counter = itertools.count(1)
+
+
+def new_request_id() -> str:
+    """Return a process-unique, monotonically increasing request id."""
+    return f"{_REQUEST_ID_PREFIX}-{next(_request_counter):x}"
+
+
+def bind_request_context(request_id: str, path: str = "") -> Token:
+    """Set the current request id/path; returns a token for `reset_request_context`."""
+    return _request_context.set((request_id, path))
+
+
+def reset_request_context(token: Token) -> None:
+    """Restore the request context that was active before `bind_request_context`."""
+    _request_context.reset(token)
+
+
+def current_request_id() -> str | None:
+    """Return the id of the request being handled, or None outside a request."""
+    ctx = _request_context.get()
+    return ctx[0] if ctx is not None else None
+
+
+def _request_context_patcher(record: Any) -> None:
+    ctx = _request_context.get()
+    if ctx is not None:
+        extra = record["extra"]
+        extra.setdefault("request_id", ctx[0])
+        extra.setdefault("path", ctx[1])
+
+
+# patcher global: semua log di dalam request otomatis membawa request_id dan path
+loguru_logger.configure(patcher=_request_context_patcher)
+
+
 def request_id() -> str:
     """Generate a unique request ID (UUID).
 
@@ -506,19 +670,102 @@ def parse_log_level(level: str) -> Level:
     return lvl if lvl in allowed else "INFO"  # type: ignore
 
 
+# --- Payload logging (lazy, truncated, sampled per request) ---
+
+
+@dataclass
+class PayloadLogConfig:
+    max_chars: int = 2000
+    sample_rate: float = 1.0
+
+
+payload_log_config = PayloadLogConfig()
+_payload_sampled: ContextVar[bool] = ContextVar("payload_sampled", default=True)
+
+
+def configure_payload_logging(
+    max_chars: int | None = None, sample_rate: float | None = None
+) -> PayloadLogConfig:
+    """Update global payload logging limits (dipanggil sekali saat startup)."""
+    if max_chars is not None:
+        payload_log_config.max_chars = max(0, int(max_chars))
+    if sample_rate is not None:
+        payload_log_config.sample_rate = min(1.0, max(0.0, float(sample_rate)))
+    return payload_log_config
+
+
+def sample_payload_logging(rate: float | None = None) -> bool:
+    """Decide once per request whether payload dumps are logged.
+
+    Keputusan disimpan di contextvar, jadi semua `log_payload` di request
+    yang sama (router, forwarder, processor) ikut keputusan ini.
+    """
+    rate = payload_log_config.sample_rate if rate is None else rate
+    sampled = rate >= 1 or (rate > 0 and random.random() < rate)
+    _payload_sampled.set(sampled)
+    return sampled
+
+
+def truncate_payload(text: str, max_chars: int | None = None) -> str:
+    """Cut `text` to `max_chars`, noting how many characters were dropped."""
+    limit = payload_log_config.max_chars if max_chars is None else max_chars
+    if limit <= 0 or len(text) <= limit:
+        return text
+    return f"{text[:limit]}... (+{len(text) - limit} chars)"
+
+
+def log_payload(
+    message: str,
+    payload: Any,
+    *,
+    level: Level = "DEBUG",
+    formatter: Callable[[Any], str] = repr,
+    log: Any = None,
+) -> None:
+    """Log a (possibly large) payload without formatting it unless it is emitted.
+
+    Payload hanya di-format kalau level aktif di salah satu sink dan request
+    ini lolos sampling, lalu dipotong sesuai `payload_log_config.max_chars`.
+
+    Example:
+        >>> log_payload(
+        ...     "[listpaket] Upstream response",
+        ...     resp,
+        ...     formatter=json.dumps,
+        ... )
+    """
+    if not _payload_sampled.get():
+        return
+    # opt(lazy=True) memanggil semua args, jadi message di-escape, bukan dijadikan arg
+    template = message.replace("{", "{{").replace("}", "}}") + ": {}"
+    (log or loguru_logger).opt(lazy=True, depth=1).log(
+        level, template, lambda: truncate_payload(formatter(payload))
+    )
+
+
 __all__ = [
+    "BufferedSink",
     "LogConfig",
     "LoggerManager",
+    "PayloadLogConfig",
+    "bind_request_context",
     "caller_info",
+    "configure_payload_logging",
+    "current_request_id",
     "log_error",
     "log_error",
     "log_exception_with_caller",
+    "log_payload",
     "logger",
     "logger",
     "logger_progress",
     "logger_progress",
+    "new_request_id",
     "parse_log_level",
     "parse_log_level",
     "request_id",
     "request_id",
+    "reset_request_context",
+    "sample_payload_logging",
+    "truncate_payload",
 ]
@@ -3,6 +3,11 @@ import re
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 ALLOWED_COLUMNS = {"productid", "productname", "quota", "total_"}
+# param pagination milik parser, tidak diteruskan ke upstream
+PAGINATION_PARAMS = ("page", "page_size", "max_chars")
+# param lokal parser (pagination + proyeksi `kolom`): tidak diteruskan ke
+# upstream dan tidak ikut key response cache / coalescing
+LOCAL_PARAMS = (*PAGINATION_PARAMS, "kolom")
 
 
 class ListParseRequest(BaseModel):
@@ -38,6 +43,28 @@ class ListParseRequest(BaseModel):
         examples=["productId,productName,quota,total_"],
     )
 
+    page: int | None = Field(
+        default=None,
+        ge=1,
+        description="Nomor halaman (opsional); mengaktifkan mode pagination",
+    )
+    page_size: int | None = Field(
+        default=None, ge=1, description="Jumlah paket per halaman (opsional)"
+    )
+    max_chars: int | None = Field(
+        default=None,
+        ge=1,
+        description="Panjang maksimal message per halaman, termasuk header (opsional)",
+    )
+
+    @property
+    def is_paginated(self) -> bool:
+        return (
+            self.page is not None
+            or self.page_size is not None
+            or self.max_chars is not None
+        )
+
     @field_validator("kolom")
     @classmethod
     def validate_kolom(cls, v: str | None) -> str | None:
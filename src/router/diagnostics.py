@@ -0,0 +1,26 @@
+"""endpoint diagnostics untuk kondisi upstream (circuit breaker, account pool, antrean)."""
+
+from fastapi import APIRouter, Depends
+from src.dependencies.req_depends import get_module_registry
+from src.services.module_registry import ModuleRegistry
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/upstream")
+async def upstream_status(
+    registry: ModuleRegistry = Depends(get_module_registry),
+) -> dict:
+    """Return circuit breaker, account pool, hedging and admission state per module."""
+    modules = {}
+    for name, services in registry.items():
+        hedger = getattr(services.upstream, "hedger", None)
+        limiter = getattr(services.upstream, "limiter", None)
+        modules[name] = {
+            "base_url": services.config.base_url,
+            "circuit": services.breaker.stats() if services.breaker else None,
+            "accounts": services.accounts.stats() if services.accounts else None,
+            "hedging": hedger.stats() if hedger else None,
+            "admission": limiter.stats() if limiter else None,
+        }
+    return {"modules": modules, "breakers": registry.breakers.stats()}
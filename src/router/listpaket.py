@@ -1,15 +1,223 @@
 import traceback
+from collections.abc import AsyncIterator
+from contextlib import AbstractContextManager, nullcontext
 
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import PlainTextResponse
-from src.dependencies.req_depends import get_request_forwarder, get_response_processor
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from src.dependencies.req_depends import (
+    get_module_services,
+    get_request_forwarder,
+    get_response_processor,
+)
 from src.interfaces.ireq_forwarder import IRequestForwarder
 from src.interfaces.ireq_response import IResponseProcessor
-from src.mlogger import log_error
-from src.prev_schemas import ListParseRequest
+from src.metrics import HistogramChild
+from src.mlogger import log_error, log_payload, logger, sample_payload_logging
+from src.prev_schemas import LOCAL_PARAMS, ListParseRequest
+from src.schemas.catalog_snapshot import CatalogSnapshot
+from src.schemas.paket_record import parse_kolom
+from src.schemas.upstream import ByteMeter
+from src.services.json_codec import default_codec
+from src.services.module_registry import ModuleServices
+from src.services.resp_cache import SnapshotCache, build_request_key
+from src.services.size_budget import STRATEGIES
 
 router = APIRouter()
 
+_BUDGET_NONE = "budget:(strategy=none|pages=1)"
+
+
+def _stage(timer: HistogramChild | None) -> AbstractContextManager[None]:
+    return timer.time() if timer is not None else nullcontext()
+
+
+def _snapshot_cache(
+    req: ListParseRequest, services: ModuleServices
+) -> SnapshotCache | None:
+    """Snapshot cache for this request, or None if it could never be reused."""
+    # tanpa response cache, snapshot hanya berguna untuk page berikutnya:
+    # request biasa selalu dapat response baru, jadi lookup pasti basi
+    if req.is_paginated or services.cache is not None:
+        return services.snapshots
+    return None
+
+
+async def _load_snapshot(
+    req: ListParseRequest,
+    upstream_query: dict,
+    forwarder: IRequestForwarder,
+    processor: IResponseProcessor,
+    services: ModuleServices,
+) -> CatalogSnapshot:
+    """Fetch and process the catalog, reusing the module snapshot cache."""
+    cache = _snapshot_cache(req, services)
+    response_cached = services.cache is not None
+    key = None
+    if cache is not None:
+        # snapshot di-render per proyeksi, jadi `kolom` ikut key snapshot
+        snapshot_query = (
+            {**upstream_query, "kolom": req.kolom} if req.kolom else upstream_query
+        )
+        key = build_request_key(
+            req.end,
+            snapshot_query,
+            services.config.cache_exclude_params,
+            # prefix `to` hanya berlaku bersama response cache (opt-in)
+            services.config.cache_to_prefix_length if response_cached else None,
+        )
+        if req.is_paginated:
+            # page berikutnya dilayani dari catalog yang sama, tanpa fetch upstream
+            snapshot = cache.get(key)
+            if snapshot is not None:
+                return snapshot
+    # proyeksi `kolom`: hanya kolom ini yang dibaca, dibersihkan dan di-render
+    columns = parse_kolom(req.kolom)
+    metrics = services.metrics
+    if services.config.stream_parse:
+        meter = ByteMeter()
+        # fetch dan process berjalan bersamaan, jadi diukur sebagai satu stage
+        with _stage(metrics and metrics.stream_process):
+            processed = await processor.aprocess(
+                forwarder.stream_items(
+                    req.end, upstream_query, key="paket", meter=meter
+                ),
+                columns,
+            )
+            snapshot = processor.build_snapshot(
+                processed, raw_size=meter.bytes, columns=columns
+            )
+    else:
+        resp = await forwarder.forward(req.end, upstream_query)
+        log_payload(f"[listpaket] Forwarded to {req.end}, response", resp)
+        if cache is not None and response_cached:
+            snapshot = cache.lookup(key, resp)
+            if snapshot is not None:
+                return snapshot
+        raw_data = resp["paket"] if isinstance(resp, dict) and "paket" in resp else []
+        raw_size = getattr(resp, "raw_size", None)
+        if raw_size is None:
+            raw_size = len(default_codec().dumps(resp))
+        with _stage(metrics and metrics.process):
+            snapshot = processor.build_snapshot(
+                processor.process(raw_data, columns),
+                # source hanya disimpan untuk cek identitas ke response cache
+                source=resp if response_cached else None,
+                raw_size=raw_size,
+                columns=columns,
+            )
+    if metrics is not None and snapshot.raw_size is not None:
+        metrics.upstream_size.observe(snapshot.raw_size)
+    if cache is not None:
+        cache.set(key, snapshot)
+    return snapshot
+
+
+def _char_limit(req: ListParseRequest, services: ModuleServices) -> int | None:
+    """Tightest character limit of the response: request `max_chars` or module budget."""
+    budget_chars = services.budget.max_chars if services.budget is not None else None
+    limits = [limit for limit in (req.max_chars, budget_chars) if limit and limit > 0]
+    return min(limits) if limits else None
+
+
+def _info_reserve(
+    snapshot: CatalogSnapshot, limit: int | None, services: ModuleServices
+) -> int:
+    """Upper bound of the `info=` prefix length, reserved inside the char limit."""
+    if limit is None or not services.config.enable_stats:
+        return 0
+    # page/pages tidak pernah lebih dari jumlah paket, panjang message <= limit
+    count = max(1, len(snapshot))
+    strategy = max(STRATEGIES, key=len)
+    extra_info = max(
+        len(f"budget:(strategy={strategy}|pages={count}|page={count})"),
+        len(f"page:(page={count}|pages={count}|list={count})"),
+    )
+    return len(_info_prefix(snapshot, limit, "")) + extra_info
+
+
+def _render_message(
+    req: ListParseRequest,
+    category: str,
+    snapshot: CatalogSnapshot,
+    processor: IResponseProcessor,
+    services: ModuleServices,
+) -> tuple[str, str]:
+    """Return the message and its extra `info=` stats (page or budget).
+
+    Message + prefix `info=` selalu muat di `max_chars` / budget module.
+    """
+    header = processor.response_header(req.trxid, req.to, category)
+    limit = _char_limit(req, services)
+    reserve = _info_reserve(snapshot, limit, services)
+    page = req.page or 1
+    if (
+        req.page_size is not None
+        or req.max_chars is not None
+        or (req.page is not None and services.budget is None)
+    ):
+        max_items = req.page_size
+        if max_items is None and req.max_chars is None:
+            max_items = services.config.default_page_size
+        room = max(1, limit - reserve - len(header)) if limit else None
+        ranges = snapshot.page_ranges(max_items=max_items, max_chars=room)
+        if page > len(ranges):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Page {page} out of range (1..{len(ranges)})",
+            )
+        start, end = ranges[page - 1]
+        message = header + snapshot.page_body(start, end)
+        return message, f"page:(page={page}|pages={len(ranges)}|list={end - start})"
+    if services.budget is None:
+        message = processor.to_response_string(
+            result=snapshot, trxid=req.trxid, to=req.to, category=category
+        )
+        return message, ""
+    # message dipadatkan/dipecah supaya muat di batas channel downstream;
+    # hanya page yang diminta yang dikirim, page lain lewat `page=N`
+    fitted = services.budget.render(snapshot, header, reserve)
+    if page > fitted.pages:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Page {page} out of range (1..{fitted.pages})",
+        )
+    extra_info = f"budget:(strategy={fitted.strategy}|pages={fitted.pages}"
+    if fitted.pages > 1:
+        extra_info += f"|page={page}"
+    return fitted.messages[page - 1], extra_info + ")"
+
+
+def _info_prefix(snapshot: CatalogSnapshot, message_len: int, extra_info: str) -> str:
+    stats = snapshot.stats
+    return f"info=before:(char={snapshot.raw_size}|list={stats['product_before']})after:(char={message_len}|list={stats['product_after']}){extra_info}&"
+
+
+async def _stream_message(
+    prefix: str, header: str, snapshot: CatalogSnapshot, chunk_chars: int
+) -> AsyncIterator[str]:
+    yield prefix + header
+    for chunk in snapshot.iter_chunks(chunk_chars):
+        yield chunk
+
+
+def _can_stream(
+    req: ListParseRequest,
+    header: str,
+    snapshot: CatalogSnapshot,
+    services: ModuleServices,
+) -> bool:
+    """Stream only plain full listings; paged/compacted messages are built as strings.
+
+    Message yang lolos budget paling panjang `max_message_chars`, jadi streaming
+    baru berarti untuk listing besar kalau budget module nonaktif.
+    """
+    if not services.config.stream_response or req.is_paginated:
+        return False
+    if services.budget is None:
+        return True
+    reserve = _info_reserve(snapshot, _char_limit(req, services), services)
+    return services.budget.fits(snapshot, header, reserve)
+
 
 @router.get("/listpaket", response_class=PlainTextResponse)
 async def parse_list_paket(
@@ -17,6 +225,7 @@ async def parse_list_paket(
     req: ListParseRequest = Depends(ListParseRequest),
     forwarder: IRequestForwarder = Depends(get_request_forwarder),
     processor: IResponseProcessor = Depends(get_response_processor),
+    services: ModuleServices = Depends(get_module_services),
 ) -> PlainTextResponse:
     """Parse and process a list of paket from a forwarded request.
 
@@ -30,39 +239,63 @@ async def parse_list_paket(
         Dependency for forwarding the request.
     processor : IResponseProcessor
         Dependency for processing the response.
+    services : ModuleServices
+        Cached services and config of the requested module.
 
     Returns:
     -------
     str
         The processed response string.
     """
-    logger = getattr(request.state, "logger", None)
+    sample_payload_logging()
     try:
         query_dict = dict(request.query_params)
-        if logger:
-            logger.info(f"[listpaket] Incoming request: {query_dict}")
+        logger.info("[listpaket] Incoming request", query_params=query_dict)
+        upstream_query = {k: v for k, v in query_dict.items() if k not in LOCAL_PARAMS}
 
-        resp = await forwarder.forward(req.end, query_dict)
-        if logger:
-            logger.debug(f"[listpaket] Forwarded to {req.end}, response: {resp}")
-
-        raw_data = resp["paket"] if isinstance(resp, dict) and "paket" in resp else []
+        snapshot = await _load_snapshot(
+            req, upstream_query, forwarder, processor, services
+        )
+        log_payload("[listpaket] Processed data", snapshot.records)
 
-        processed = processor.process(raw_data)
-        if logger:
-            logger.debug(f"[listpaket] Processed data: {processed}")
+        category = query_dict.get("category", "paket")
+        header = processor.response_header(req.trxid, req.to, category)
+        if _can_stream(req, header, snapshot, services):
+            # panjang message diketahui dari ukuran fragment, jadi info= bisa
+            # dikirim duluan tanpa membangun message utuh
+            log_payload(
+                "[listpaket] Final message",
+                snapshot,
+                formatter=lambda s: header + s.body(),
+            )
+            if services.metrics is not None:
+                services.metrics.response_size.observe(len(header) + snapshot.body_size)
+            prefix = ""
+            if services.config.enable_stats:
+                extra_info = "" if services.budget is None else _BUDGET_NONE
+                prefix = _info_prefix(
+                    snapshot, len(header) + snapshot.body_size, extra_info
+                )
+            return StreamingResponse(
+                _stream_message(
+                    prefix, header, snapshot, services.config.stream_chunk_chars
+                ),
+                media_type="text/plain; charset=utf-8",
+            )
 
-        message = processor.to_response_string(
-            result=processed,
-            trxid=req.trxid,
-            to=req.to,
-            category=query_dict.get("category", "paket"),
+        metrics = services.metrics
+        with _stage(metrics and metrics.render):
+            message, extra_info = _render_message(
+                req, category, snapshot, processor, services
+            )
+        if metrics is not None:
+            metrics.response_size.observe(len(message))
+        log_payload("[listpaket] Final message", message, formatter=str)
+        if not services.config.enable_stats:
+            return PlainTextResponse(content=message)
+        return PlainTextResponse(
+            content=_info_prefix(snapshot, len(message), extra_info) + message
         )
-        stats = processor.get_stats()
-        if logger:
-            logger.debug(f"[listpaket] Final message: {message}")
-        info_str = f"info=before:(char={stats['char_before']}|list={stats['product_before']})after:(char={stats['char_after']}|list={stats['product_after']})"
-        return PlainTextResponse(content=f"{info_str}&{message}")
     except Exception as exc:
         log_error(exc, "[listpaket] ERROR: Unhandled exception")
         traceback.print_exc()
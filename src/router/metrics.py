@@ -0,0 +1,109 @@
+"""endpoint /metrics (format text Prometheus)."""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from src.dependencies.req_depends import get_module_registry
+from src.metrics import REGISTRY, render_samples
+from src.services.module_registry import ModuleRegistry
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _cache_stats(registry: ModuleRegistry) -> list[tuple[dict, dict]]:
+    stats = []
+    for name, services in registry.items():
+        quota_memo = getattr(services.processor, "quota_memo", None)
+        caches = {
+            "response": services.cache,
+            "snapshot": services.snapshots,
+            "quota": quota_memo,
+        }
+        for cache_name, cache in caches.items():
+            if cache is not None:
+                stats.append(({"module": name, "cache": cache_name}, cache.stats()))
+    return stats
+
+
+def _limiter_stats(registry: ModuleRegistry) -> list[tuple[dict, dict]]:
+    stats = []
+    for name, services in registry.items():
+        limiter = getattr(services.upstream, "limiter", None)
+        if limiter is not None:
+            stats.append(({"module": name, "account": ""}, limiter.stats()))
+        for slot in services.accounts.slots if services.accounts else ():
+            if slot.limiter is not None:
+                labels = {"module": name, "account": slot.name}
+                stats.append((labels, slot.limiter.stats()))
+    return stats
+
+
+def render_registry_metrics(registry: ModuleRegistry) -> str:
+    """Render scrape-time metrics read from the stats of the module services."""
+    caches = _cache_stats(registry)
+    limiters = _limiter_stats(registry)
+    breakers = registry.breakers.stats()
+    parts = [
+        render_samples(
+            "modparser_cache_hits_total",
+            "counter",
+            "Cache hits per module cache.",
+            [(labels, s["hits"]) for labels, s in caches],
+        ),
+        render_samples(
+            "modparser_cache_misses_total",
+            "counter",
+            "Cache misses per module cache.",
+            [(labels, s["misses"]) for labels, s in caches],
+        ),
+        render_samples(
+            "modparser_cache_hit_ratio",
+            "gauge",
+            "Cache hit ratio since startup.",
+            [(labels, s["hit_ratio"]) for labels, s in caches],
+        ),
+        render_samples(
+            "modparser_admission_queue_depth",
+            "gauge",
+            "Upstream calls waiting for a concurrency slot.",
+            [(labels, s["queue_depth"]) for labels, s in limiters],
+        ),
+        render_samples(
+            "modparser_admission_in_use",
+            "gauge",
+            "Upstream concurrency slots in use.",
+            [(labels, s["in_use"]) for labels, s in limiters],
+        ),
+        render_samples(
+            "modparser_admission_wait_seconds_total",
+            "counter",
+            "Total time spent waiting for a concurrency slot.",
+            [(labels, s["wait_seconds_total"]) for labels, s in limiters],
+        ),
+        render_samples(
+            "modparser_admission_rejected_total",
+            "counter",
+            "Upstream calls shed (queue full or queue timeout).",
+            [(labels, s["rejected"] + s["timeouts"]) for labels, s in limiters],
+        ),
+        render_samples(
+            "modparser_circuit_open",
+            "gauge",
+            "1 if the circuit breaker of the upstream is not closed.",
+            [
+                ({"base_url": b["base_url"]}, int(b["state"] != "closed"))
+                for b in breakers
+            ],
+        ),
+    ]
+    return "".join(parts)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(
+    registry: ModuleRegistry = Depends(get_module_registry),
+) -> PlainTextResponse:
+    """Return the process metrics in the Prometheus text format."""
+    body = REGISTRY.render() + render_registry_metrics(registry)
+    return PlainTextResponse(body, media_type=CONTENT_TYPE)
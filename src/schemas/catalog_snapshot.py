@@ -0,0 +1,147 @@
+from collections.abc import Collection, Hashable, Iterator, Sequence
+from typing import Any
+
+from src.schemas.paket_record import PaketRecord
+
+
+def render_fragment(record: PaketRecord, columns: Collection[str] | None = None) -> str:
+    """Render one paket as `@{pid}#{name}({quota})#{total}`.
+
+    Dengan `columns` (proyeksi dari param `kolom`) hanya bagian kolom yang
+    diminta yang ditulis, urutannya tetap sama.
+    """
+    if columns is None:
+        return (
+            f"@{record.product_id}#{record.product_name}"
+            f"({record.quota or '-'})#{record.total}"
+        )
+    parts = []
+    if "product_id" in columns:
+        parts.append(f"@{record.product_id}")
+    if "product_name" in columns:
+        parts.append(f"#{record.product_name}")
+    if "quota" in columns:
+        parts.append(f"({record.quota or '-'})")
+    if "total" in columns:
+        parts.append(f"#{record.total}")
+    return "".join(parts)
+
+
+def pack_pages(
+    fragments: Sequence[str], max_chars: int | None = None, max_items: int | None = None
+) -> list[tuple[int, int]]:
+    """Greedily group fragments into pages, returned as (start, end) index ranges.
+
+    Page ditutup kalau fragment berikutnya membuat page lebih dari `max_chars`
+    karakter atau `max_items` paket. Fragment yang sendirian sudah melebihi
+    `max_chars` tetap jadi satu page (fragment tidak pernah dipotong).
+    """
+    ranges: list[tuple[int, int]] = []
+    start = size = 0
+    for i, fragment in enumerate(fragments):
+        if i > start and (
+            (max_items is not None and i - start >= max_items)
+            or (max_chars is not None and size + len(fragment) > max_chars)
+        ):
+            ranges.append((start, i))
+            start, size = i, 0
+        size += len(fragment)
+    if start < len(fragments) or not ranges:
+        ranges.append((start, len(fragments)))
+    return ranges
+
+
+class CatalogSnapshot:
+    """Processed catalog with its paket fragments already rendered.
+
+    Dibuat sekali per response upstream (yang di-cache) lalu dipakai ulang
+    oleh request berikutnya: message akhir cukup header + join fragment.
+    Urutan sort_by_name dihitung sekali saat pertama diminta.
+    """
+
+    __slots__ = (
+        "_bodies",
+        "columns",
+        "fragments",
+        "memo",
+        "raw_size",
+        "records",
+        "source",
+        "stats",
+    )
+
+    def __init__(
+        self,
+        records: Sequence[PaketRecord],
+        stats: dict | None = None,
+        source: Any = None,
+        raw_size: int | None = None,
+        columns: Collection[str] | None = None,
+    ):
+        self.records = tuple(records)
+        # proyeksi kolom output, None = semua kolom
+        self.columns = columns
+        self.fragments = tuple(render_fragment(r, columns) for r in self.records)
+        self.stats = stats if stats is not None else getattr(records, "stats", {})
+        # response upstream asal snapshot; snapshot basi kalau response berganti
+        self.source = source
+        # ukuran body upstream (byte), untuk statistik info=before:(char=...)
+        self.raw_size = raw_size
+        self._bodies: dict[bool, str] = {}
+        # turunan snapshot (misal hasil compaction BudgetRenderer), ikut umur snapshot
+        self.memo: dict[Hashable, Any] = {}
+
+    def body(self, sort_by_name: bool = False) -> str:
+        """Return the joined fragments, optionally ordered by lower-cased name."""
+        body = self._bodies.get(sort_by_name)
+        if body is None:
+            if sort_by_name:
+                order = sorted(
+                    range(len(self.records)),
+                    key=lambda i: self.records[i].product_name.lower(),
+                )
+                body = "".join(self.fragments[i] for i in order)
+            else:
+                body = "".join(self.fragments)
+            self._bodies[sort_by_name] = body
+        return body
+
+    def page_ranges(
+        self, max_items: int | None = None, max_chars: int | None = None
+    ) -> list[tuple[int, int]]:
+        """Return the page boundaries for this catalog (cached per page setting)."""
+        key = ("pages", max_items, max_chars)
+        ranges = self.memo.get(key)
+        if ranges is None:
+            ranges = pack_pages(
+                self.fragments, max_chars=max_chars, max_items=max_items
+            )
+            self.memo[key] = ranges
+        return ranges
+
+    def page_body(self, start: int, end: int) -> str:
+        return "".join(self.fragments[start:end])
+
+    @property
+    def body_size(self) -> int:
+        """Length of `body()` without building it."""
+        size = self.memo.get("body_size")
+        if size is None:
+            size = self.memo["body_size"] = sum(map(len, self.fragments))
+        return size
+
+    def iter_chunks(self, chunk_chars: int = 16384) -> Iterator[str]:
+        """Yield the body as joined batches of roughly `chunk_chars` characters."""
+        batch: list[str] = []
+        size = 0
+        for fragment in self.fragments:
+            batch.append(fragment)
+            size += len(fragment)
+            if size >= chunk_chars:
+                yield "".join(batch)
+                batch, size = [], 0
+        if batch:
+            yield "".join(batch)
+
+    def __len__(self) -> int:
+        return len(self.records)
@@ -0,0 +1,86 @@
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+# nama kolom upstream -> nama atribut PaketRecord
+PAKET_COLUMNS = {
+    "productId": "product_id",
+    "productName": "product_name",
+    "quota": "quota",
+    "total_": "total",
+}
+
+ALL_COLUMNS = frozenset(PAKET_COLUMNS.values())
+# nama kolom `kolom` (case-insensitive) -> nama atribut
+_KOLOM_TO_ATTR = {column.lower(): attr for column, attr in PAKET_COLUMNS.items()}
+
+
+def parse_kolom(kolom: str | None) -> frozenset[str] | None:
+    """Map the `kolom` query param to PaketRecord attribute names.
+
+    Returns None (semua kolom) kalau `kolom` kosong atau berisi semua kolom.
+    """
+    if not kolom:
+        return None
+    columns = frozenset(
+        _KOLOM_TO_ATTR[k.strip().lower()] for k in kolom.split(",") if k.strip()
+    )
+    return None if not columns or columns == ALL_COLUMNS else columns
+
+
+def _text(value: Any) -> str:
+    return str(value).strip().upper() if value is not None else ""
+
+
+@dataclass(slots=True)
+class PaketRecord:
+    """Compact paket row holding only the columns used by /listpaket.
+
+    Dibuat langsung dari item upstream tanpa menyalin seluruh dict; hanya
+    productId, productName, quota dan total_ yang diambil dan di-uppercase.
+    Akses gaya dict (`record["productName"]`, `record.get("quota")`) tetap
+    didukung memakai nama kolom upstream.
+    """
+
+    product_id: str = ""
+    product_name: str = ""
+    quota: str = ""
+    total: str = ""
+
+    @classmethod
+    def from_upstream(
+        cls, paket: Mapping[str, Any], columns: Collection[str] | None = None
+    ) -> "PaketRecord":
+        """Pick and normalize the needed columns of an upstream paket item.
+
+        Kalau `columns` diisi (nama atribut), kolom lain tidak dibaca dan
+        dibiarkan kosong.
+        """
+        get = paket.get
+        if columns is None:
+            return cls(
+                _text(get("productId")),
+                _text(get("productName")),
+                _text(get("quota")),
+                _text(get("total_")),
+            )
+        return cls(
+            _text(get("productId")) if "product_id" in columns else "",
+            _text(get("productName")) if "product_name" in columns else "",
+            _text(get("quota")) if "quota" in columns else "",
+            _text(get("total_")) if "total" in columns else "",
+        )
+
+    def __getitem__(self, column: str) -> str:
+        try:
+            return getattr(self, PAKET_COLUMNS[column])
+        except KeyError:
+            raise KeyError(column) from None
+
+    def get(self, column: str, default: Any = None) -> Any:
+        attr = PAKET_COLUMNS.get(column)
+        return getattr(self, attr) if attr else default
+
+    def to_dict(self) -> dict[str, str]:
+        """Return the record keyed by upstream column names."""
+        return {column: getattr(self, attr) for column, attr in PAKET_COLUMNS.items()}
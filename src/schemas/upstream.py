@@ -0,0 +1,24 @@
+from typing import Any
+
+
+class UpstreamResponse(dict):
+    """Decoded upstream JSON object plus the size of the raw body it came from.
+
+    `raw_size` adalah jumlah byte body HTTP dari upstream, dipakai untuk
+    statistik `info=before:(char=...)` tanpa perlu serialize ulang payload.
+    """
+
+    __slots__ = ("raw_size",)
+
+    def __init__(self, data: dict[str, Any], raw_size: int):
+        super().__init__(data)
+        self.raw_size = raw_size
+
+
+class ByteMeter:
+    """Counts body bytes consumed while streaming an upstream response."""
+
+    __slots__ = ("bytes",)
+
+    def __init__(self):
+        self.bytes = 0
@@ -0,0 +1,185 @@
+import itertools
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from typing import Literal
+
+from src.mlogger import logger
+from src.services.admission import AdmissionLimiter
+from src.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.settings.base import Account
+
+Strategy = Literal["round_robin", "least_outstanding", "latency_ewma"]
+
+
+class AccountSlot:
+    """Runtime state of one upstream account (base_url) in an AccountPool."""
+
+    __slots__ = (
+        "account",
+        "base_url",
+        "breaker",
+        "failures",
+        "in_flight",
+        "latency_ewma",
+        "limiter",
+        "name",
+        "requests",
+    )
+
+    def __init__(self, name: str, base_url: str, account: Account | None = None):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.account = account
+        # circuit breaker base_url ini; slot di-eject dari pool selama open
+        self.breaker: CircuitBreaker | None = None
+        # batas call bersamaan ke account ini, None = tanpa batas
+        self.limiter: AdmissionLimiter | None = None
+        self.in_flight = 0
+        # rata-rata latency (detik) tereksponensial, None = belum pernah dipakai
+        self.latency_ewma: float | None = None
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def active(self) -> bool:
+        if self.account is not None and not self.account.is_aktif:
+            return False
+        return self.breaker is None or self.breaker.available()
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "base_url": self.base_url,
+            "active": self.active,
+            "circuit": self.breaker.state if self.breaker else None,
+            "admission": self.limiter.stats() if self.limiter else None,
+            "in_flight": self.in_flight,
+            "latency_ewma": self.latency_ewma,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+class AccountPool:
+    """Spreads upstream calls over the active accounts of a module.
+
+    Strategi:
+    - round_robin: bergiliran
+    - least_outstanding: account dengan request in-flight paling sedikit
+    - latency_ewma: skor terkecil dari latency EWMA x (in-flight + 1);
+      account yang belum pernah dipakai dicoba dulu
+
+    Slot yang circuit breaker-nya open tidak dipilih (outlier ejection) sampai
+    breaker masuk half-open.
+    """
+
+    def __init__(
+        self,
+        slots: Iterable[AccountSlot],
+        strategy: Strategy = "round_robin",
+        ewma_alpha: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.slots = list(slots)
+        if not self.slots:
+            raise ValueError("AccountPool needs at least one account")
+        self.strategy = strategy
+        self.ewma_alpha = ewma_alpha
+        self._clock = clock
+        self._counter = itertools.count()
+        self._pick = {
+            "round_robin": self._round_robin,
+            "least_outstanding": self._least_outstanding,
+            "latency_ewma": self._latency_ewma,
+        }[strategy]
+        self.logger = logger.bind(class_name="AccountPool")
+
+    @classmethod
+    def from_accounts(
+        cls,
+        accounts: Iterable[Account],
+        default_base_url: str,
+        strategy: Strategy = "round_robin",
+    ) -> "AccountPool | None":
+        """Build a pool from BussinessConfig accounts; None if none is active.
+
+        Account tanpa base_url memakai base_url module.
+        """
+        slots = [
+            AccountSlot(acc.username, acc.base_url or default_base_url, acc)
+            for acc in accounts
+            if acc.is_aktif
+        ]
+        return cls(slots, strategy=strategy) if slots else None
+
+    def candidates(self) -> list[AccountSlot]:
+        """Active slots that may receive traffic."""
+        return [slot for slot in self.slots if slot.active]
+
+    def _round_robin(self, slots: list[AccountSlot]) -> AccountSlot:
+        return slots[next(self._counter) % len(slots)]
+
+    def _least_outstanding(self, slots: list[AccountSlot]) -> AccountSlot:
+        # mulai dari posisi bergiliran supaya seri tidak selalu jatuh ke slot pertama
+        offset = next(self._counter) % len(slots)
+        rotated = slots[offset:] + slots[:offset]
+        return min(rotated, key=lambda s: s.in_flight)
+
+    def _latency_ewma(self, slots: list[AccountSlot]) -> AccountSlot:
+        offset = next(self._counter) % len(slots)
+        rotated = slots[offset:] + slots[:offset]
+        return min(
+            rotated,
+            key=lambda s: (s.latency_ewma or 0.0) * (s.in_flight + 1),
+        )
+
+    def has_alternative(self, exclude: AccountSlot | None) -> bool:
+        """Return True if an active slot other than `exclude` can take a call."""
+        return any(slot is not exclude for slot in self.candidates())
+
+    def choose(self, exclude: AccountSlot | None = None) -> AccountSlot:
+        """Pick the slot for the next call (optionally not `exclude`).
+
+        Raises:
+            CircuitOpenError: If every slot is inactive or ejected by its breaker.
+        """
+        candidates = self.candidates()
+        if not candidates:
+            retry_after = min(
+                (s.breaker.retry_after() for s in self.slots if s.breaker), default=0.0
+            )
+            raise CircuitOpenError(self.slots[0].base_url, retry_after)
+        slots = [s for s in candidates if s is not exclude] or candidates
+        # account yang slot concurrency-nya penuh baru dipilih kalau semua penuh
+        free = [s for s in slots if s.limiter is None or not s.limiter.saturated]
+        return self._pick(free or slots)
+
+    def record(self, slot: AccountSlot, latency: float, ok: bool) -> None:
+        slot.requests += 1
+        if not ok:
+            slot.failures += 1
+        if slot.latency_ewma is None:
+            slot.latency_ewma = latency
+        else:
+            slot.latency_ewma += self.ewma_alpha * (latency - slot.latency_ewma)
+
+    @contextmanager
+    def lease(self, exclude: AccountSlot | None = None) -> Iterator[AccountSlot]:
+        """Pick a slot and track it as in flight; latency/outcome recorded on exit."""
+        slot = self.choose(exclude)
+        slot.in_flight += 1
+        start = self._clock()
+        try:
+            yield slot
+        except Exception:
+            self.record(slot, self._clock() - start, ok=False)
+            raise
+        else:
+            self.record(slot, self._clock() - start, ok=True)
+        finally:
+            # call yang di-cancel (misal kalah hedge) tidak dicatat
+            slot.in_flight -= 1
+
+    def stats(self) -> list[dict]:
+        return [slot.stats() for slot in self.slots]
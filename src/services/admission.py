@@ -0,0 +1,114 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from src.mlogger import logger
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a call is shed because the limiter queue is full or timed out."""
+
+    def __init__(self, name: str, reason: str, retry_after: float = 1.0):
+        super().__init__(f"{name}: {reason}")
+        self.name = name
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """Async semaphore with a bounded wait queue and a queue timeout.
+
+    Maksimal `max_concurrent` call berjalan bersamaan; call berikutnya antre
+    (maks `max_queue`) paling lama `queue_timeout` detik. Antrean penuh atau
+    timeout -> AdmissionRejectedError (load shedding), jadi request tidak menumpuk.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int = 100,
+        queue_timeout: float = 2.0,
+    ):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_use = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.logger = logger.bind(class_name="AdmissionLimiter")
+
+    @property
+    def saturated(self) -> bool:
+        """True if a new call would have to wait."""
+        return self.in_use >= self.max_concurrent or self.waiting > 0
+
+    async def _wait(self) -> None:
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejectedError(self.name, "queue full", self.queue_timeout)
+        self.waiting += 1
+        self.queued += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            self.timeouts += 1
+            self.logger.warning(
+                "Queue timeout, request shed",
+                limiter=self.name,
+                waiting=self.waiting,
+                queue_timeout=self.queue_timeout,
+            )
+            raise AdmissionRejectedError(
+                self.name, "queue timeout", self.queue_timeout
+            ) from None
+        finally:
+            self.waiting -= 1
+            waited = loop.time() - start
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one concurrency slot for the duration of the block.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the wait timed out.
+        """
+        if self.saturated:
+            await self._wait()
+        else:
+            await self._semaphore.acquire()
+        self.admitted += 1
+        self.in_use += 1
+        try:
+            yield
+        finally:
+            self.in_use -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.max_concurrent,
+            "in_use": self.in_use,
+            "queue_depth": self.waiting,
+            "queue_depth_max": self.max_waiting,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
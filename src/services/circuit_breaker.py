@@ -0,0 +1,199 @@
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Literal
+
+import httpx
+
+from src.config.mod_settings import ModuleConfig
+from src.mlogger import logger
+
+State = Literal["closed", "open", "half_open"]
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, base_url: str, retry_after: float):
+        super().__init__(f"Circuit open for {base_url}, retry after {retry_after:.1f}s")
+        self.base_url = base_url
+        self.retry_after = retry_after
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Network errors, timeouts, 5xx and 429 count against the upstream; 4xx do not."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(exc, httpx.TransportError)
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one upstream base_url.
+
+    - closed: semua call lewat; hasil `window_size` call terakhir dicatat.
+      Kalau minimal `min_calls` tercatat dan rasio gagal >= `error_rate`,
+      breaker open. Call yang lebih lambat dari `slow_call_seconds` dihitung gagal.
+    - open: call langsung ditolak (CircuitOpenError) selama `open_seconds`.
+    - half_open: maksimal `half_open_calls` call percobaan; semua sukses ->
+      closed, satu gagal -> open lagi.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        window_size: int = 20,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_call_seconds: float | None = None,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.base_url = base_url
+        self.min_calls = max(1, min_calls)
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = max(1, half_open_calls)
+        self._clock = clock
+        # True = call gagal (error atau lambat)
+        self._window: deque[bool] = deque(maxlen=max(1, window_size))
+        self._state: State = "closed"
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self.rejected = 0
+        self.opened = 0
+        self.logger = logger.bind(class_name="CircuitBreaker")
+
+    @classmethod
+    def from_module_config(
+        cls, base_url: str, module_cfg: ModuleConfig
+    ) -> "CircuitBreaker":
+        return cls(
+            base_url,
+            window_size=module_cfg.breaker_window,
+            min_calls=module_cfg.breaker_min_calls,
+            error_rate=module_cfg.breaker_error_rate,
+            slow_call_seconds=module_cfg.breaker_slow_call_seconds,
+            open_seconds=module_cfg.breaker_open_seconds,
+            half_open_calls=module_cfg.breaker_half_open_calls,
+        )
+
+    @property
+    def state(self) -> State:
+        if self._state == "open" and self.retry_after() <= 0:
+            self._state = "half_open"
+            self._probes = self._probe_successes = 0
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe call through."""
+        if self._state != "open":
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - self._clock())
+
+    def available(self) -> bool:
+        """Return True if a call would currently be let through (does not reserve it)."""
+        state = self.state
+        if state == "closed":
+            return True
+        return state == "half_open" and self._probes < self.half_open_calls
+
+    def acquire(self) -> bool:
+        """Reserve a call; in half-open state this takes one probe slot."""
+        if not self.available():
+            self.rejected += 1
+            return False
+        if self._state == "half_open":
+            self._probes += 1
+        return True
+
+    def release(self) -> None:
+        """Give back a reserved call that never completed (e.g. cancelled)."""
+        if self._state == "half_open" and self._probes > 0:
+            self._probes -= 1
+
+    def record(self, latency: float, ok: bool) -> None:
+        """Record the outcome of a call reserved with `acquire`."""
+        slow = self.slow_call_seconds is not None and latency > self.slow_call_seconds
+        failed = not ok or slow
+        if self._state == "half_open":
+            if failed:
+                self._trip("probe failed")
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_calls:
+                self._state = "closed"
+                self._window.clear()
+                self.logger.info("Circuit closed", base_url=self.base_url)
+            return
+        if self._state == "open":
+            # call yang sudah jalan sebelum breaker open, abaikan
+            return
+        self._window.append(failed)
+        if len(self._window) >= self.min_calls and self.failure_rate >= self.error_rate:
+            self._trip("failure rate")
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Wrap one upstream call: fast-fail if open, record latency and outcome."""
+        if not self.acquire():
+            raise CircuitOpenError(self.base_url, self.retry_after())
+        start = self._clock()
+        try:
+            yield
+        except Exception as exc:
+            self.record(self._clock() - start, ok=not is_upstream_failure(exc))
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record(self._clock() - start, ok=True)
+
+    @property
+    def failure_rate(self) -> float:
+        return sum(self._window) / len(self._window) if self._window else 0.0
+
+    def _trip(self, reason: str) -> None:
+        self._state = "open"
+        self._opened_at = self._clock()
+        self.opened += 1
+        self.logger.warning(
+            "Circuit opened",
+            base_url=self.base_url,
+            reason=reason,
+            failure_rate=round(self.failure_rate, 3),
+            open_seconds=self.open_seconds,
+        )
+
+    def stats(self) -> dict:
+        return {
+            "base_url": self.base_url,
+            "state": self.state,
+            "failure_rate": round(self.failure_rate, 3),
+            "calls_in_window": len(self._window),
+            "retry_after": round(self.retry_after(), 3),
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreakerRegistry:
+    """One CircuitBreaker per upstream base_url, shared by every module using it."""
+
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, base_url: str, module_cfg: ModuleConfig) -> CircuitBreaker:
+        base_url = base_url.rstrip("/")
+        breaker = self._breakers.get(base_url)
+        if breaker is None:
+            breaker = CircuitBreaker.from_module_config(base_url, module_cfg)
+            self._breakers[base_url] = breaker
+        return breaker
+
+    def stats(self) -> list[dict]:
+        return [breaker.stats() for breaker in self._breakers.values()]
@@ -0,0 +1,90 @@
+import math
+from collections import deque
+
+from src.config.mod_settings import ModuleConfig
+
+
+class Hedger:
+    """Decides when a slow upstream call gets a hedge (second) request.
+
+    Delay hedge = persentil `percentile` dari latency `window` call sukses
+    terakhir (minimal `min_delay`); belum ada hedge sebelum `min_samples`
+    latency terkumpul. Jumlah hedge dibatasi token bucket: tiap request
+    menambah `max_rate` token (maks 1), tiap hedge memakai 1 token, jadi
+    hedge tidak pernah lebih dari `max_rate` x jumlah request.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_delay: float = 0.05,
+        max_rate: float = 0.1,
+        window: int = 200,
+        min_samples: int = 20,
+    ):
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_rate = max_rate
+        self.min_samples = max(1, min_samples)
+        self._latencies: deque[float] = deque(maxlen=max(1, window))
+        self._delay: float | None = None
+        self._dirty = True
+        self._tokens = 0.0
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.throttled = 0
+
+    @classmethod
+    def from_module_config(cls, module_cfg: ModuleConfig) -> "Hedger":
+        return cls(
+            percentile=module_cfg.hedge_percentile,
+            min_delay=module_cfg.hedge_min_delay_seconds,
+            max_rate=module_cfg.hedge_max_rate,
+            window=module_cfg.hedge_window,
+            min_samples=module_cfg.hedge_min_samples,
+        )
+
+    def observe(self, latency: float) -> None:
+        """Record the latency (seconds) of a successful upstream call."""
+        self._latencies.append(latency)
+        self._dirty = True
+
+    def delay(self) -> float | None:
+        """Current hedge delay, or None while there are too few samples."""
+        if len(self._latencies) < self.min_samples:
+            return None
+        if self._dirty:
+            ordered = sorted(self._latencies)
+            rank = math.ceil(self.percentile / 100 * len(ordered)) - 1
+            self._delay = max(
+                self.min_delay, ordered[min(max(rank, 0), len(ordered) - 1)]
+            )
+            self._dirty = False
+        return self._delay
+
+    def begin(self) -> float | None:
+        """Start a hedgeable request: earn hedge budget and return the delay."""
+        self.requests += 1
+        self._tokens = min(1.0, self._tokens + self.max_rate)
+        return self.delay()
+
+    def try_hedge(self) -> bool:
+        """Spend hedge budget for one hedge request; False if the cap is reached."""
+        # toleransi pembulatan float (10 x 0.1 != 1.0)
+        if self._tokens < 1.0 - 1e-9:
+            self.throttled += 1
+            return False
+        self._tokens = max(0.0, self._tokens - 1.0)
+        self.hedged += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "delay": self.delay(),
+            "samples": len(self._latencies),
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "throttled": self.throttled,
+        }
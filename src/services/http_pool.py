@@ -0,0 +1,64 @@
+import importlib.util
+
+import httpx
+
+from src.config.mod_settings import ModuleConfig
+from src.mlogger import logger
+
+
+def _h2_available() -> bool:
+    """Cek apakah package `h2` terinstall (dibutuhkan httpx untuk HTTP/2)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpClientPool:
+    """Holds one pooled httpx.AsyncClient per module, created once at startup.
+
+    Client dipakai ulang oleh RequestForwarder supaya koneksi keep-alive ke
+    upstream tidak dibuka ulang (TCP handshake + DNS) di setiap request.
+    """
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self.logger = logger.bind(class_name="HttpClientPool")
+
+    @staticmethod
+    def build_client(module_cfg: ModuleConfig) -> httpx.AsyncClient:
+        """Build an AsyncClient with the pool limits of a module."""
+        limits = httpx.Limits(
+            max_connections=module_cfg.max_connections,
+            max_keepalive_connections=module_cfg.max_keepalive_connections,
+            keepalive_expiry=module_cfg.keepalive_expiry,
+        )
+        http2 = module_cfg.http2
+        if http2 and not _h2_available():
+            logger.warning(
+                f"HTTP/2 requested for module '{module_cfg.name}' but 'h2' is not installed, falling back to HTTP/1.1"
+            )
+            http2 = False
+        return httpx.AsyncClient(timeout=module_cfg.timeout, limits=limits, http2=http2)
+
+    def start(self, modules: dict[str, ModuleConfig]) -> None:
+        """Create a client for every configured module."""
+        for name, module_cfg in modules.items():
+            if name in self._clients:
+                continue
+            self._clients[name] = self.build_client(module_cfg)
+            self.logger.info(
+                "HTTP client pool created",
+                module=name,
+                max_connections=module_cfg.max_connections,
+                max_keepalive_connections=module_cfg.max_keepalive_connections,
+                http2=module_cfg.http2,
+            )
+
+    def get(self, name: str) -> httpx.AsyncClient | None:
+        """Return the pooled client of a module, or None if not started."""
+        return self._clients.get(name)
+
+    async def aclose(self) -> None:
+        """Close all pooled clients (dipanggil saat app shutdown)."""
+        for name, client in self._clients.items():
+            await client.aclose()
+            self.logger.info("HTTP client pool closed", module=name)
+        self._clients.clear()
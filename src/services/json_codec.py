@@ -0,0 +1,100 @@
+import importlib.util
+import json
+import os
+from functools import lru_cache
+from typing import Any
+
+from src.mlogger import logger
+
+# urutan backend yang dicoba saat APP_JSON_BACKEND=auto
+_AUTO_ORDER = ("orjson", "msgspec", "json")
+
+
+class JsonCodec:
+    """Stdlib `json` backend; always available and used as fallback.
+
+    Backend cepat (orjson/msgspec) dipilih per deployment lewat env
+    APP_JSON_BACKEND (auto, json, orjson, msgspec).
+    """
+
+    name = "json"
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, default=str)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson  # noqa: PLC0415
+
+        self._orjson = orjson
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self._orjson.dumps(obj, default=str).decode()
+
+
+class MsgspecCodec(JsonCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec  # noqa: PLC0415
+
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder(enc_hook=str)
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self._encoder.encode(obj).decode()
+
+
+_BACKENDS: dict[str, type[JsonCodec]] = {
+    "json": JsonCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+
+def available_backends() -> list[str]:
+    """Return the backends that can be used in this environment."""
+    return [
+        name
+        for name in _BACKENDS
+        if name == "json" or importlib.util.find_spec(name) is not None
+    ]
+
+
+@lru_cache
+def get_codec(name: str = "auto") -> JsonCodec:
+    """Return the codec for a backend name, falling back to stdlib if unavailable.
+
+    Args:
+        name (str): "auto", "json", "orjson" atau "msgspec".
+
+    Returns:
+        JsonCodec: Codec instance (cached per name).
+    """
+    name = name.strip().lower()
+    available = available_backends()
+    if name == "auto":
+        name = next(b for b in _AUTO_ORDER if b in available)
+    elif name not in available:
+        logger.warning(
+            f"JSON backend '{name}' is not available, falling back to stdlib json"
+        )
+        name = "json"
+    return _BACKENDS[name]()
+
+
+def default_codec() -> JsonCodec:
+    """Codec selected for this deployment via the APP_JSON_BACKEND env var."""
+    return get_codec(os.getenv("APP_JSON_BACKEND", "auto"))
@@ -0,0 +1,170 @@
+import codecs
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+from typing import Any
+
+from src.schemas.upstream import ByteMeter
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+class JsonArrayItemScanner:
+    """Incrementally extracts the items of `{"<key>": [ ... ]}` from JSON text chunks.
+
+    Hanya satu item yang di-decode pada satu waktu, jadi seluruh payload tidak
+    pernah dimaterialisasi sebagai dict tree. Field top-level lain di-skip.
+    """
+
+    def __init__(self, key: str = "paket"):
+        self.key = key
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "seek"
+        # state untuk fase seek (cari key di level top object)
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string: str | None = None
+        self._found_key = False
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    def feed(self, text: str) -> Iterator[Any]:
+        """Add a chunk of text and yield every item that is now complete."""
+        if self._state == "done":
+            return
+        self._buffer += text
+        if self._state == "seek":
+            self._seek()
+        if self._state == "items":
+            yield from self._items(final=False)
+        self._compact()
+
+    def close(self) -> Iterator[Any]:
+        """Flush remaining items at end of input; raise if the array is truncated."""
+        if self._state == "items":
+            yield from self._items(final=True)
+        if self._state == "items":
+            raise ValueError(f"Truncated JSON: array '{self.key}' is not closed")
+        self._state = "done"
+
+    def _compact(self) -> None:
+        keep = self._string_start if self._in_string else self._pos
+        if keep > 0:
+            self._buffer = self._buffer[keep:]
+            self._pos -= keep
+            if self._in_string:
+                self._string_start = 0
+
+    def _seek(self) -> None:
+        buf = self._buffer
+        i = self._pos
+        n = len(buf)
+        while i < n:
+            ch = buf[i]
+            if self._in_string:
+                self._scan_string_char(ch, i)
+            elif self._found_key:
+                if ch not in _WHITESPACE:
+                    self._enter_value(ch, i)
+                    return
+            elif self._scan_structural_char(ch, i):
+                return
+            i += 1
+        self._pos = i
+
+    def _scan_string_char(self, ch: str, i: int) -> None:
+        if self._escape:
+            self._escape = False
+        elif ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+            if self._depth == 1:
+                self._last_string = json.loads(self._buffer[self._string_start : i + 1])
+
+    def _scan_structural_char(self, ch: str, i: int) -> bool:
+        """Track depth/keys outside strings; return True if the top object closed."""
+        if ch == '"':
+            self._in_string = True
+            self._string_start = i
+        elif ch in "{[":
+            self._depth += 1
+        elif ch in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self._state = "done"
+                self._pos = i + 1
+                return True
+        elif ch == ":" and self._depth == 1 and self._last_string == self.key:
+            self._found_key = True
+        elif ch == ",":
+            self._last_string = None
+        return False
+
+    def _enter_value(self, ch: str, i: int) -> None:
+        if ch != "[":
+            # key ada tapi bukan array (misal null): tidak ada item
+            self._state = "done"
+            self._pos = i
+            return
+        self._state = "items"
+        self._pos = i + 1
+
+    def _items(self, final: bool) -> Iterator[Any]:
+        buf = self._buffer
+        n = len(buf)
+        while True:
+            i = self._pos
+            while i < n and (buf[i] in _WHITESPACE or buf[i] == ","):
+                i += 1
+            self._pos = i
+            if i >= n:
+                return
+            if buf[i] == "]":
+                self._state = "done"
+                self._pos = i + 1
+                return
+            try:
+                item, end = self._decoder.raw_decode(buf, i)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                return
+            # angka yang belum diikuti delimiter bisa saja belum lengkap
+            # (misal "1." dari "1.5"), tunggu chunk berikutnya
+            if (
+                not final
+                and isinstance(item, int | float)
+                and (end >= n or buf[end] not in _DELIMITERS)
+            ):
+                return
+            self._pos = end
+            yield item
+
+
+async def iter_json_array_items(
+    chunks: AsyncIterable[bytes],
+    key: str = "paket",
+    encoding: str = "utf-8",
+    meter: ByteMeter | None = None,
+) -> AsyncIterator[Any]:
+    """Yield the items of the top-level array `key` from a stream of byte chunks."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    scanner = JsonArrayItemScanner(key)
+    async for chunk in chunks:
+        if meter is not None:
+            meter.bytes += len(chunk)
+        for item in scanner.feed(decoder.decode(chunk)):
+            yield item
+        if scanner.done:
+            return
+    for item in scanner.feed(decoder.decode(b"", final=True)):
+        yield item
+    for item in scanner.close():
+        yield item
@@ -0,0 +1,233 @@
+from dataclasses import dataclass
+
+from src.config.mod_settings import ModuleConfig
+from src.interfaces.ireq_forwarder import IRequestForwarder
+from src.interfaces.ireq_response import IResponseProcessor
+from src.metrics import ModuleMetrics
+from src.mlogger import logger
+from src.services.account_pool import AccountPool
+from src.services.admission import AdmissionLimiter
+from src.services.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from src.services.hedging import Hedger
+from src.services.http_pool import HttpClientPool
+from src.services.quota_pipeline import get_quota_pipeline
+from src.services.req_forwarder import RequestForwarder
+from src.services.req_response import ResponseProcessor
+from src.services.resp_cache import CachedRequestForwarder, SnapshotCache, TTLCache
+from src.services.retry_policy import RetryPolicy
+from src.services.single_flight import CoalescingRequestForwarder
+from src.services.size_budget import DEFAULT_ABBREVIATIONS, BudgetRenderer
+from src.settings.base import Account
+
+# dipakai kalau module tidak mengisi list_regex_replacement
+DEFAULT_REGEX_REPLACEMENT = [
+    r"\b(DAYS?|HARI)\b",
+    r"(\d+)\s*GB",
+    r"(\d+)\s*D",
+    r"\bINTERNET\b",
+]
+
+
+@dataclass(frozen=True, slots=True)
+class ModuleServices:
+    """Ready-made, shareable services of one module."""
+
+    config: ModuleConfig
+    forwarder: IRequestForwarder
+    processor: IResponseProcessor
+    # forwarder asli (tanpa cache/coalescing), untuk diagnostics
+    upstream: IRequestForwarder | None = None
+    cache: TTLCache | None = None
+    # snapshot catalog yang sudah di-render (reuse per response cache + pagination)
+    snapshots: SnapshotCache | None = None
+    # pembatas panjang message /listpaket, None = tanpa batas
+    budget: BudgetRenderer | None = None
+    # account upstream yang dipakai bergantian, None = hanya base_url module
+    accounts: AccountPool | None = None
+    # circuit breaker base_url module (kalau tanpa account pool)
+    breaker: CircuitBreaker | None = None
+    # child metrics /metrics (durasi stage, ukuran payload) milik module ini
+    metrics: ModuleMetrics | None = None
+
+
+class ModuleRegistry:
+    """Builds forwarder/processor per module once at startup, keyed by module name.
+
+    ModuleConfig tidak berubah setelah startup, jadi instance yang sama aman
+    dipakai bersama oleh semua request. State processor hanya memo quota
+    (hasil clean per string quota), yang valid selama config module sama.
+    """
+
+    def __init__(
+        self,
+        http_pool: HttpClientPool | None = None,
+        default_max_chars: int = 0,
+        accounts: dict[str, list[Account]] | None = None,
+    ):
+        self.http_pool = http_pool
+        # dari BussinessConfig.accounts, key = nama module
+        self.accounts = accounts or {}
+        # dari BussinessConfig.response_global.min_inbound_characters
+        self.default_max_chars = default_max_chars
+        # satu breaker per base_url upstream, dipakai bersama antar module
+        self.breakers = CircuitBreakerRegistry()
+        self._services: dict[str, ModuleServices] = {}
+        self.logger = logger.bind(class_name="ModuleRegistry")
+
+    def build_account_pool(
+        self, name: str, module_cfg: ModuleConfig
+    ) -> AccountPool | None:
+        if not module_cfg.use_accounts:
+            return None
+        pool = AccountPool.from_accounts(
+            self.accounts.get(name, []),
+            module_cfg.base_url,
+            strategy=module_cfg.account_strategy,
+        )
+        if pool is None:
+            self.logger.warning(
+                "use_accounts is set but module has no active account", module=name
+            )
+            return None
+        for slot in pool.slots:
+            slot.breaker = self.build_breaker(slot.base_url, module_cfg)
+            slot.limiter = self.build_limiter(
+                f"{name}:{slot.name}",
+                module_cfg.max_concurrent_per_account,
+                module_cfg,
+            )
+        return pool
+
+    @staticmethod
+    def build_limiter(
+        name: str, max_concurrent: int, module_cfg: ModuleConfig
+    ) -> AdmissionLimiter | None:
+        if max_concurrent <= 0:
+            return None
+        return AdmissionLimiter(
+            name,
+            max_concurrent,
+            max_queue=module_cfg.max_queue_size,
+            queue_timeout=module_cfg.queue_timeout_seconds,
+        )
+
+    def build_breaker(
+        self, base_url: str, module_cfg: ModuleConfig
+    ) -> CircuitBreaker | None:
+        if not module_cfg.circuit_breaker:
+            return None
+        return self.breakers.get(base_url, module_cfg)
+
+    def build_forwarder(self, name: str, module_cfg: ModuleConfig) -> IRequestForwarder:
+        account_pool = self.build_account_pool(name, module_cfg)
+        return RequestForwarder(
+            target_base_url=module_cfg.base_url,
+            client=self.http_pool.get(name) if self.http_pool else None,
+            retry_policy=RetryPolicy.from_module_config(module_cfg),
+            method=module_cfg.wire_method,
+            account_pool=account_pool,
+            breaker=None
+            if account_pool
+            else self.build_breaker(module_cfg.base_url, module_cfg),
+            hedger=Hedger.from_module_config(module_cfg)
+            if module_cfg.hedge_requests
+            else None,
+            limiter=self.build_limiter(
+                name, module_cfg.max_concurrent_requests, module_cfg
+            ),
+            module=name,
+        )
+
+    @staticmethod
+    def build_processor(module_cfg: ModuleConfig) -> IResponseProcessor:
+        return ResponseProcessor(
+            exclude_product=module_cfg.exclude_product,
+            list_prefixes=module_cfg.list_prefixes or [],
+            replace_with_regex=module_cfg.replace_with_regex,
+            list_regex_replacement=module_cfg.list_regex_replacement
+            or DEFAULT_REGEX_REPLACEMENT,
+            fuse_regex=module_cfg.fuse_regex_replacement,
+            list_suffixes=module_cfg.list_suffixes,
+            list_contains=module_cfg.list_contains,
+            list_exclude_regex=module_cfg.list_exclude_regex,
+            quota_memo_size=module_cfg.quota_memo_size,
+        )
+
+    def build_budget(self, module_cfg: ModuleConfig) -> BudgetRenderer | None:
+        max_chars = module_cfg.max_message_chars
+        if max_chars is None:
+            max_chars = self.default_max_chars
+        if max_chars <= 0:
+            return None
+        # regex hanya jadi strategi compaction kalau module mengisi polanya
+        # sendiri dan belum dipakai processor; pola default menghapus isi
+        # quota ("1 GB"), jadi tidak dipakai diam-diam untuk memadatkan message
+        patterns = module_cfg.list_regex_replacement
+        pipeline = (
+            get_quota_pipeline(patterns)
+            if patterns and not module_cfg.replace_with_regex
+            else None
+        )
+        abbreviations = module_cfg.budget_abbreviations
+        return BudgetRenderer(
+            max_chars,
+            pipeline=pipeline,
+            abbreviations=DEFAULT_ABBREVIATIONS
+            if abbreviations is None
+            else abbreviations,
+            drop_columns=module_cfg.budget_drop_columns,
+        )
+
+    def start(self, modules: dict[str, ModuleConfig]) -> None:
+        """Build the services of every configured module (sekali, di lifespan)."""
+        for name, module_cfg in modules.items():
+            processor = self.build_processor(module_cfg)
+            upstream = forwarder = self.build_forwarder(name, module_cfg)
+            if module_cfg.coalesce_requests:
+                forwarder = CoalescingRequestForwarder(
+                    forwarder,
+                    exclude_params=module_cfg.cache_exclude_params,
+                )
+            cache = snapshots = None
+            if module_cfg.cache_ttl_seconds > 0:
+                cache = TTLCache(
+                    max_entries=module_cfg.cache_max_entries,
+                    ttl_seconds=module_cfg.cache_ttl_seconds,
+                )
+                forwarder = CachedRequestForwarder(
+                    forwarder,
+                    cache,
+                    module_cfg.cache_exclude_params,
+                    to_prefix_length=module_cfg.cache_to_prefix_length,
+                )
+            snapshot_ttl = (
+                module_cfg.cache_ttl_seconds or module_cfg.page_cache_ttl_seconds
+            )
+            if module_cfg.snapshot_cache and snapshot_ttl > 0:
+                snapshots = SnapshotCache(
+                    max_entries=module_cfg.cache_max_entries,
+                    ttl_seconds=snapshot_ttl,
+                )
+            self._services[name] = ModuleServices(
+                config=module_cfg,
+                forwarder=forwarder,
+                processor=processor,
+                upstream=upstream,
+                cache=cache,
+                snapshots=snapshots,
+                budget=self.build_budget(module_cfg),
+                accounts=getattr(upstream, "account_pool", None),
+                breaker=getattr(upstream, "breaker", None),
+                metrics=ModuleMetrics(name),
+            )
+            self.logger.info("Module services ready", module=name)
+            self.logger.debug("Module config", module=name, config=module_cfg)
+
+    def get(self, name: str) -> ModuleServices | None:
+        return self._services.get(name)
+
+    def items(self) -> list[tuple[str, ModuleServices]]:
+        return list(self._services.items())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._services
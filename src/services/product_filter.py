@@ -0,0 +1,45 @@
+import re
+from collections.abc import Iterable
+
+
+def _normalize(values: Iterable[str] | None) -> tuple[str, ...]:
+    # dedupe tapi urutan tetap, supaya hasil compile deterministik
+    return tuple(dict.fromkeys(v.strip().upper() for v in values or () if v.strip()))
+
+
+class ProductExcluder:
+    """Product-name exclusion rules compiled once per module config.
+
+    Semua rule case-insensitive:
+    - prefixes/suffixes: satu `str.startswith(tuple)` / `str.endswith(tuple)`
+    - contains + regex: digabung jadi satu regex, cukup satu `search` per nama
+    """
+
+    __slots__ = ("contains", "patterns", "prefixes", "regex", "suffixes")
+
+    def __init__(
+        self,
+        prefixes: Iterable[str] | None = None,
+        suffixes: Iterable[str] | None = None,
+        contains: Iterable[str] | None = None,
+        patterns: Iterable[str] | None = None,
+    ):
+        self.prefixes = _normalize(prefixes)
+        self.suffixes = _normalize(suffixes)
+        self.contains = _normalize(contains)
+        self.patterns = tuple(p for p in patterns or () if p)
+        parts = [re.escape(c) for c in self.contains]
+        parts += [f"(?:{p})" for p in self.patterns]
+        self.regex = re.compile("|".join(parts), re.IGNORECASE) if parts else None
+
+    def __bool__(self) -> bool:
+        return bool(self.prefixes or self.suffixes or self.regex)
+
+    def matches(self, product_name: str) -> bool:
+        """Return True if the product name hits any exclusion rule."""
+        name = product_name.upper()
+        if self.prefixes and name.startswith(self.prefixes):
+            return True
+        if self.suffixes and name.endswith(self.suffixes):
+            return True
+        return self.regex is not None and self.regex.search(name) is not None
@@ -0,0 +1,99 @@
+import re
+from collections import OrderedDict
+from collections.abc import Hashable
+from functools import lru_cache
+
+# backreference (\1, (?P=name)) atau global inline flag di awal pattern
+# tidak aman digabung menjadi satu alternation
+_UNFUSABLE = re.compile(r"\\[1-9]|\(\?P=|^\(\?[aiLmsux]+\)")
+
+
+def can_fuse(patterns: tuple[str, ...]) -> bool:
+    """Return True if the patterns can be joined into a single alternation."""
+    return len(patterns) > 1 and not any(_UNFUSABLE.search(p) for p in patterns)
+
+
+class QuotaPipeline:
+    r"""Regex replacement pipeline for quota strings, compiled once per pattern list.
+
+    Default-nya setiap pattern dihapus berurutan (sama seperti `re.sub` satu per
+    satu). Dengan `fuse=True` semua pattern digabung jadi satu alternation
+    sehingga cukup satu pass per string; hasilnya bisa beda kalau pattern saling
+    overlap (misal `(\d+)\s*D` vs `\b(DAYS?|HARI)\b`), jadi fuse hanya
+    dipakai kalau diminta lewat config dan patternnya aman digabung.
+    """
+
+    __slots__ = ("compiled", "fingerprint", "fused", "patterns")
+
+    def __init__(self, patterns: tuple[str, ...], fuse: bool = False):
+        self.patterns = patterns
+        self.fused = fuse and can_fuse(patterns)
+        # identitas pipeline untuk key QuotaMemo; beda pattern = beda hasil
+        self.fingerprint = hash((patterns, self.fused))
+        if self.fused:
+            joined = "|".join(f"(?:{p})" for p in patterns)
+            self.compiled = (re.compile(joined, re.IGNORECASE),)
+        else:
+            self.compiled = tuple(re.compile(p, re.IGNORECASE) for p in patterns)
+
+    def apply(self, quota: str) -> str:
+        """Remove every pattern match, then collapse whitespace."""
+        for regex in self.compiled:
+            quota = regex.sub("", quota)
+        return " ".join(quota.split())
+
+
+@lru_cache(maxsize=64)
+def _cached_pipeline(patterns: tuple[str, ...], fuse: bool) -> QuotaPipeline:
+    return QuotaPipeline(patterns, fuse=fuse)
+
+
+def get_quota_pipeline(patterns: tuple[str, ...], fuse: bool = False) -> QuotaPipeline:
+    """Return the compiled pipeline for a pattern list (cached per module config)."""
+    return _cached_pipeline(tuple(patterns), bool(fuse))
+
+
+class QuotaMemo:
+    """Bounded LRU memo of cleaned quota strings, keyed by (pipeline fingerprint, raw quota).
+
+    Catalog upstream cuma punya beberapa ratus string quota yang berbeda, jadi
+    hasil clean + regex cukup dihitung sekali. Tidak thread-safe; dipakai di
+    satu event loop.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max(1, max_entries)
+        self._data: OrderedDict[Hashable, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> str | None:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: str) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,72 +1,359 @@
 import asyncio
+import math
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    asynccontextmanager,
+    contextmanager,
+    nullcontext,
+)
+from typing import Any, TypeVar
 
 import httpx
 from fastapi import HTTPException
 
 from src.interfaces.ireq_forwarder import IRequestForwarder
-from src.mlogger import logger
+from src.metrics import UPSTREAM_DURATION, UPSTREAM_RETRIES, HistogramChild
+from src.mlogger import log_payload, logger
+from src.schemas.upstream import ByteMeter, UpstreamResponse
+from src.services.account_pool import AccountPool, AccountSlot
+from src.services.admission import AdmissionLimiter, AdmissionRejectedError
+from src.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.services.hedging import Hedger
+from src.services.json_codec import JsonCodec, default_codec
+from src.services.json_stream import iter_json_array_items
+from src.services.retry_policy import RetryPolicy
+
+T = TypeVar("T")
 
 
 class RequestForwarder(IRequestForwarder):
     """Forwards the incoming query to a target URL asynchronously, with config-driven timeout and retries."""
 
-    def __init__(self, target_base_url: str, config: dict | None = None):
+    def __init__(
+        self,
+        target_base_url: str,
+        config: dict | None = None,
+        client: httpx.AsyncClient | None = None,
+        retry_policy: RetryPolicy | None = None,
+        method: str = "GET",
+        codec: JsonCodec | None = None,
+        account_pool: AccountPool | None = None,
+        breaker: CircuitBreaker | None = None,
+        hedger: Hedger | None = None,
+        limiter: AdmissionLimiter | None = None,
+        module: str = "default",
+    ):
         self.target_base_url = target_base_url.rstrip("/")
+        # multi-account: tiap attempt memilih base_url dari pool
+        self.account_pool = account_pool
+        # circuit breaker target_base_url (tanpa pool); slot pool punya breaker sendiri
+        self.breaker = breaker
+        # hedged request untuk call `forward` yang lambat (hanya method idempotent)
+        self.hedger = hedger
+        # batas call upstream bersamaan per module (antrean + load shedding)
+        self.limiter = limiter
+        # metrics upstream: child per account di-bind sekali lalu dipakai ulang
+        self.module = module
+        self._retries = UPSTREAM_RETRIES.labels(module)
+        self._latency: dict[str, tuple[HistogramChild, HistogramChild]] = {}
+        # client dari HttpClientPool (shared per module); None = client per attempt
+        self.client = client
         self.logger = logger.bind(class_name="RequestForwarder")
         self.config = config or {}
-        self.timeout = self.config.get("timeout", 10)
-        self.max_retries = self.config.get("max_retries", 2)
-        self.seconds_between_retries = self.config.get("seconds_between_retries", 2)
+        self.retry_policy = retry_policy or RetryPolicy.from_dict(self.config)
+        self.method = method.upper()
+        self.codec = codec or default_codec()
 
     async def forward(self, endpoint: str, query_params: dict) -> dict:
-        """Forward the GET request and return parsed JSON, with retries and detailed error logging."""
+        """Forward the request and return parsed JSON, retrying per the RetryPolicy."""
         self.logger.info(
             "Forwarding request", endpoint=endpoint, query_params=query_params
         )
-        url = f"{self.target_base_url}/{endpoint.lstrip('/')}"
-        last_exc = None
-        for attempt in range(1, self.max_retries + 1):
+        path = endpoint.lstrip("/")
+        url = f"{self.target_base_url}/{path}"
+
+        async def send(
+            timeout: float, exclude: str | None = None, used: list[str] | None = None
+        ) -> httpx.Response:
+            async with self._lease(exclude) as base_url:
+                if used is not None:
+                    used.append(base_url)
+                start = time.perf_counter()
+                response = await self._send(f"{base_url}/{path}", query_params, timeout)
+                response.raise_for_status()
+            if self.hedger is not None:
+                self.hedger.observe(time.perf_counter() - start)
+            return response
+
+        async def attempt(timeout: float) -> dict:
+            if self.hedger is not None and self.retry_policy.allows_retry(self.method):
+                response = await self._hedged(send, timeout)
+            else:
+                response = await send(timeout)
+            data = self.codec.loads(response.content)
+            if isinstance(data, dict):
+                data = UpstreamResponse(data, raw_size=len(response.content))
+            return data
+
+        data = await self._with_retries(url, query_params, attempt)
+        log_payload(
+            "Received response", data, formatter=self.codec.dumps, log=self.logger
+        )
+        return data
+
+    async def stream_items(
+        self,
+        endpoint: str,
+        query_params: dict,
+        key: str = "paket",
+        meter: ByteMeter | None = None,
+    ) -> AsyncIterator[Any]:
+        """Stream the upstream body and yield the items of array `key` one by one.
+
+        Retry hanya berlaku sampai status/header diterima; setelah body mulai
+        dibaca, error di tengah stream langsung diteruskan ke caller.
+        """
+        self.logger.info(
+            "Streaming request", endpoint=endpoint, query_params=query_params
+        )
+        path = endpoint.lstrip("/")
+        url = f"{self.target_base_url}/{path}"
+        client = self.client or httpx.AsyncClient()
+
+        async def attempt(timeout: float) -> httpx.Response:
+            # lease account (dan slot concurrency) hanya sampai header diterima
+            async with self._lease() as base_url:
+                request = client.build_request(
+                    self.method,
+                    f"{base_url}/{path}",
+                    params=query_params,
+                    timeout=timeout,
+                )
+                response = await client.send(request, stream=True)
+                if response.is_error:
+                    await response.aread()
+                    await response.aclose()
+                response.raise_for_status()
+            return response
+
+        try:
+            response = await self._with_retries(url, query_params, attempt)
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(url, params=query_params)
-                    response.raise_for_status()
-                    data = response.json()
-                    self.logger.debug("Received response", data=data)
-                    return data
-            except httpx.RequestError as e:
-                self.logger.error(  # noqa: TRY400
-                    f"[forward] Network error on attempt {attempt}/{self.max_retries}",
-                    error=str(e),
+                async for item in iter_json_array_items(
+                    response.aiter_bytes(), key, meter=meter
+                ):
+                    yield item
+            finally:
+                await response.aclose()
+        finally:
+            if client is not self.client:
+                await client.aclose()
+
+    async def _with_retries(
+        self,
+        url: str,
+        query_params: dict,
+        attempt_fn: Callable[[float], Awaitable[T]],
+    ) -> T:
+        """Run `attempt_fn(timeout)` until it succeeds or the RetryPolicy gives up."""
+        policy = self.retry_policy
+        max_attempts = policy.max_attempts if policy.allows_retry(self.method) else 1
+        loop = asyncio.get_running_loop()
+        deadline = (
+            loop.time() + policy.total_deadline if policy.total_deadline else None
+        )
+        last_exc: Exception | None = None
+        attempt = 0
+        while attempt < max_attempts:
+            attempt += 1
+            timeout = policy.timeout
+            if deadline is not None:
+                timeout = min(timeout, deadline - loop.time())
+            try:
+                return await attempt_fn(timeout)
+            except (CircuitOpenError, AdmissionRejectedError) as e:
+                # fast-fail: upstream di-eject atau antrean penuh, jangan
+                # habiskan retry budget
+                self.logger.warning(
+                    f"[forward] Upstream unavailable on attempt {attempt}/{max_attempts}",
                     url=url,
+                    reason=str(e),
+                    retry_after=e.retry_after,
                 )
-                last_exc = e
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Upstream unavailable: {e!s}",
+                    headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+                ) from e
             except httpx.HTTPStatusError as e:
                 self.logger.error(  # noqa: TRY400
-                    f"[forward] HTTP error on attempt {attempt}/{self.max_retries}",
+                    f"[forward] HTTP error on attempt {attempt}/{max_attempts}",
                     status_code=e.response.status_code,
                     error=str(e),
                     url=url,
                     response_text=e.response.text,
                 )
                 last_exc = e
+            except httpx.RequestError as e:
+                self.logger.error(  # noqa: TRY400
+                    f"[forward] Network error on attempt {attempt}/{max_attempts}",
+                    error=str(e),
+                    url=url,
+                )
+                last_exc = e
             except Exception as e:
                 self.logger.exception(
-                    f"[forward] Unexpected error on attempt {attempt}/{self.max_retries}",
+                    f"[forward] Unexpected error on attempt {attempt}/{max_attempts}",
                     error=str(e),
                     url=url,
                 )
                 last_exc = e
-            if attempt < self.max_retries:
-                await asyncio.sleep(self.seconds_between_retries)
+            if not policy.is_retryable_exception(last_exc):
+                self.logger.error("[forward] Error is not retryable", url=url)
+                break
+            if attempt >= max_attempts:
+                break
+            delay = policy.backoff(attempt)
+            if deadline is not None and loop.time() + delay >= deadline:
+                self.logger.error("[forward] Retry deadline exceeded", url=url)
+                break
+            self._retries.inc()
+            await asyncio.sleep(delay)
         # All retries failed, raise exception here (after all attempts)
         self.logger.error(
             "[forward] All retries failed", url=url, query_params=query_params
         )
         raise HTTPException(
             status_code=502,
-            detail=f"Failed to forward request after {self.max_retries} attempts: {last_exc!s}",
+            detail=f"Failed to forward request after {attempt} attempts: {last_exc!s}",
         )
 
+    async def _hedged(
+        self,
+        send: Callable[[float, str | None, list[str] | None], Awaitable[T]],
+        timeout: float,
+    ) -> T:
+        """Run `send`, firing a hedge request if it is slower than the hedge delay.
+
+        Hedge hanya dikirim kalau account pool punya slot aktif lain; tanpa
+        pool, hedge cuma request identik ke upstream yang sama. Hasil yang
+        pertama sukses dipakai dan request yang kalah di-cancel. Kalau keduanya
+        gagal, error request pertama yang diteruskan.
+        """
+        hedger = self.hedger
+        delay = hedger.begin()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        used: list[str] = []
+        primary = asyncio.ensure_future(send(timeout, None, used))
+        tasks = {primary}
+        try:
+            if delay is None or delay >= timeout:
+                return await primary
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self._can_hedge(used) or not hedger.try_hedge():
+                return await primary
+            self.logger.info(
+                "[forward] Hedging slow upstream call",
+                delay=round(delay, 3),
+                base_url=used[0],
+            )
+            remaining = max(0.001, timeout - (loop.time() - started))
+            hedge = asyncio.ensure_future(send(remaining, used[0], None))
+            tasks.add(hedge)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            hedger.hedge_wins += 1
+                        return task.result()
+            return primary.result()
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                # tunggu cancel selesai supaya lease account/breaker sudah dilepas
+                await asyncio.wait(losers)
+
+    def _slot_for(self, base_url: str | None) -> AccountSlot | None:
+        if self.account_pool is None or base_url is None:
+            return None
+        return next(
+            (s for s in self.account_pool.slots if s.base_url == base_url), None
+        )
+
+    def _can_hedge(self, used: list[str]) -> bool:
+        """True if a hedge would go to another active account than the primary."""
+        if self.account_pool is None or not used:
+            return False
+        return self.account_pool.has_alternative(self._slot_for(used[0]))
+
+    @asynccontextmanager
+    async def _lease(self, exclude: str | None = None) -> AsyncIterator[str]:
+        """Yield the base_url for one attempt, via the account pool if any.
+
+        Urutan: slot concurrency module -> pilih account -> slot concurrency
+        account -> circuit breaker. `exclude` (base_url) dihindari kalau masih
+        ada account lain yang aktif.
+
+        Raises:
+            AdmissionRejectedError: If a concurrency queue is full or timed out.
+            CircuitOpenError: If the circuit of the chosen upstream is open.
+        """
+        async with self._admit(self.limiter):
+            if self.account_pool is None:
+                with self._guard(self.breaker), self._timed("default"):
+                    yield self.target_base_url
+                return
+            with self.account_pool.lease(self._slot_for(exclude)) as slot:
+                async with self._admit(slot.limiter):
+                    with self._guard(slot.breaker), self._timed(slot.name):
+                        yield slot.base_url
+
+    @contextmanager
+    def _timed(self, account: str) -> Iterator[None]:
+        """Observe the attempt latency per account; cancelled attempts are skipped."""
+        children = self._latency.get(account)
+        if children is None:
+            children = self._latency[account] = (
+                UPSTREAM_DURATION.labels(self.module, account, "ok"),
+                UPSTREAM_DURATION.labels(self.module, account, "error"),
+            )
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            children[1].observe(time.perf_counter() - start)
+            raise
+        children[0].observe(time.perf_counter() - start)
+
+    @staticmethod
+    def _admit(limiter: AdmissionLimiter | None) -> AbstractAsyncContextManager[None]:
+        return limiter.slot() if limiter is not None else nullcontext()
+
+    @staticmethod
+    def _guard(breaker: CircuitBreaker | None) -> AbstractContextManager[None]:
+        return breaker.guard() if breaker is not None else nullcontext()
+
+    async def _send(
+        self, url: str, query_params: dict, timeout: float
+    ) -> httpx.Response:
+        """Send the request through the pooled client, or a one-off client if none."""
+        if self.client is not None:
+            return await self.client.request(
+                self.method, url, params=query_params, timeout=timeout
+            )
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            return await client.request(self.method, url, params=query_params)
+
     async def forward_get(self, endpoint: str, query_params: dict) -> dict:
         self.logger.info(
             "Calling forward_get", endpoint=endpoint, query_params=query_params
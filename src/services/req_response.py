@@ -1,7 +1,25 @@
-import re
+from collections.abc import AsyncIterable, Collection, Iterable
 
 from src.interfaces.ireq_response import IResponseProcessor
-from src.mlogger import logger
+from src.mlogger import log_payload, logger
+from src.schemas.catalog_snapshot import CatalogSnapshot
+from src.schemas.paket_record import PaketRecord
+from src.services.product_filter import ProductExcluder
+from src.services.quota_pipeline import QuotaMemo, QuotaPipeline, get_quota_pipeline
+
+
+class ProcessedPakets(list):
+    """Result list of `process()` carrying its before/after statistics.
+
+    Statistik dikembalikan bersama hasil (bukan disimpan di processor) supaya
+    satu instance ResponseProcessor aman dipakai request yang berjalan bersamaan.
+    """
+
+    __slots__ = ("stats",)
+
+    def __init__(self, items: list[PaketRecord], stats: dict):
+        super().__init__(items)
+        self.stats = stats
 
 
 class ResponseProcessor(IResponseProcessor):
@@ -13,13 +31,31 @@ class ResponseProcessor(IResponseProcessor):
         list_prefixes: list[str] | None = None,
         replace_with_regex: bool = False,
         list_regex_replacement: list[str] | None = None,
+        fuse_regex: bool = False,
+        list_suffixes: list[str] | None = None,
+        list_contains: list[str] | None = None,
+        list_exclude_regex: list[str] | None = None,
+        quota_memo_size: int = 0,
     ):
         self.exclude_product = exclude_product
-        self.prefixes = [p.strip().upper() for p in (list_prefixes or [])]
+        # semua rule exclusion di-compile sekali jadi satu matcher
+        self.excluder = ProductExcluder(
+            prefixes=list_prefixes,
+            suffixes=list_suffixes,
+            contains=list_contains,
+            patterns=list_exclude_regex,
+        )
+        self.prefixes = list(self.excluder.prefixes)
         self.replace_with_regex = replace_with_regex
         self.regexs_replacement = list_regex_replacement or []
+        # regex di-compile sekali di sini, bukan di setiap paket
+        self.pipeline: QuotaPipeline = get_quota_pipeline(
+            tuple(self.regexs_replacement) if replace_with_regex else (),
+            fuse=fuse_regex,
+        )
+        # memo hasil clean quota lintas request, 0 = nonaktif
+        self.quota_memo = QuotaMemo(quota_memo_size) if quota_memo_size > 0 else None
         self.logger = logger.bind(class_name="ResponseProcessor")
-        self._stats = {}  # Tambahkan internal state untuk statistik
 
     def clean_quota_parts(self, quota: str) -> str:
         """Cleans quota string by removing text before '/' and extra spaces."""
@@ -35,61 +71,92 @@ class ResponseProcessor(IResponseProcessor):
         """Simplifies quota string by applying regex replacements if enabled."""
         if not quota or not str(quota).strip():
             return ""
-        if self.replace_with_regex and self.regexs_replacement:
-            for regex in self.regexs_replacement:
-                quota = re.sub(regex, "", quota, flags=re.IGNORECASE)
-        quota = re.sub(r"\s+", " ", quota).strip()
-        return quota
+        return self.pipeline.apply(quota)
+
+    def _read_columns(self, columns: Collection[str] | None) -> frozenset[str] | None:
+        """Kolom yang perlu dibaca: proyeksi + productName kalau exclusion aktif."""
+        if columns is None:
+            return None
+        if self.exclude_product and self.excluder:
+            return frozenset(columns) | {"product_name"}
+        return frozenset(columns)
+
+    def process_item(
+        self, paket: dict, columns: Collection[str] | None = None
+    ) -> PaketRecord | None:
+        """Build a cleaned PaketRecord from one upstream item; None if excluded.
+
+        Dengan `columns`, hanya kolom itu yang dibaca/di-uppercase dan quota
+        hanya dibersihkan kalau diminta.
+        """
+        record = PaketRecord.from_upstream(paket, columns)
+        if (
+            self.exclude_product
+            and self.excluder
+            and self.excluder.matches(record.product_name)
+        ):
+            return None
+        if record.quota:
+            record.quota = self.clean_quota(record.quota)
+        return record
 
-    def process(self, paket_list: list[dict]) -> list[dict]:
+    def clean_quota(self, quota: str) -> str:
+        """Run clean_quota_parts + simplify_quota_words, memoized if enabled."""
+        memo = self.quota_memo
+        if memo is None:
+            return self.simplify_quota_words(self.clean_quota_parts(quota))
+        key = (self.pipeline.fingerprint, quota)
+        cleaned = memo.get(key)
+        if cleaned is None:
+            cleaned = self.simplify_quota_words(self.clean_quota_parts(quota))
+            memo.set(key, cleaned)
+        return cleaned
+
+    def process(
+        self, paket_list: Iterable[dict], columns: Collection[str] | None = None
+    ) -> ProcessedPakets:
         """Processes a list of paket dictionaries by filtering and cleaning based on config flags."""
-        self.logger.debug("Processing paket_list", paket_list=paket_list)
-        before_total_product = len(paket_list)
-        before_total_char = sum(len(str(p)) for p in paket_list)
-        self.logger.info(
-            "Before processing",
-            total_char_before=before_total_char,
-            total_product_before=before_total_product,
-        )
+        read_columns = self._read_columns(columns)
         result = []
+        before_total_product = 0
         for paket in paket_list:
-            processed = {
-                k: v.upper() if isinstance(v, str) else v for k, v in paket.items()
-            }
-            if (
-                self.exclude_product
-                and self.prefixes
-                and any(
-                    str(processed.get("productName", "")).startswith(prefix)
-                    for prefix in self.prefixes
-                )
-            ):
-                continue
-            raw_quota = str(processed.get("quota", ""))
-            cleaned = self.clean_quota_parts(raw_quota)
-            simplified = self.simplify_quota_words(cleaned)
-            processed["quota"] = simplified
-            result.append(processed)
-        after_total_product = len(result)
-        after_total_char = sum(len(str(p)) for p in result)
-        self.logger.info(
-            "After processing",
-            total_char_after=after_total_char,
-            total_product_after=after_total_product,
-        )
-        self.logger.debug("Processed result", result=result)
-        # Simpan statistik ke internal state
-        self._stats = {
-            "char_before": before_total_char,
-            "char_after": after_total_char,
+            before_total_product += 1
+            processed = self.process_item(paket, read_columns)
+            if processed is not None:
+                result.append(processed)
+        return self._finish(result, before_total_product)
+
+    async def aprocess(
+        self,
+        paket_items: AsyncIterable[dict],
+        columns: Collection[str] | None = None,
+    ) -> ProcessedPakets:
+        """Process paket as they stream in; excluded items are dropped immediately."""
+        read_columns = self._read_columns(columns)
+        result = []
+        before_total_product = 0
+        async for paket in paket_items:
+            before_total_product += 1
+            processed = self.process_item(paket, read_columns)
+            if processed is not None:
+                result.append(processed)
+        return self._finish(result, before_total_product)
+
+    def _finish(
+        self, result: list[PaketRecord], before_total_product: int
+    ) -> ProcessedPakets:
+        # statistik ukuran (char) dihitung di router dari raw body upstream dan
+        # panjang message final, bukan dari str() setiap paket
+        stats = {
             "product_before": before_total_product,
-            "product_after": after_total_product,
+            "product_after": len(result),
         }
-        return result
+        self.logger.info("Processed paket", **stats)
+        return ProcessedPakets(result, stats)
 
     def to_response_string(
         self,
-        result: list[dict],
+        result: list[PaketRecord] | CatalogSnapshot,
         trxid: str,
         to: str,
         category: str = "paket",
@@ -98,28 +165,18 @@ class ResponseProcessor(IResponseProcessor):
         """Format hasil menjadi satu string line untuk response.
 
         Format: trxid=...&to=...&status=success&message=listpaket in {category} : {result}
+        Kalau `result` sudah berupa CatalogSnapshot, fragment paket tidak
+        di-render ulang.
         """
         self.logger.debug(
-            "Formatting response string",
-            result=result,
-            trxid=trxid,
-            to=to,
-            category=category,
+            "Formatting response string", trxid=trxid, to=to, category=category
+        )
+        if not isinstance(result, CatalogSnapshot):
+            result = self.build_snapshot(result)
+        log_payload("Formatting result", result.records, log=self.logger)
+        final = result.body(sort_by_name)
+        response_str = self.response_header(trxid, to, category) + final
+        log_payload(
+            "Response string created", response_str, formatter=str, log=self.logger
         )
-        if sort_by_name:
-            result = sorted(result, key=lambda p: str(p.get("productName", "")).lower())
-        parts = []
-        for p in result:
-            pid = f"@{str(p.get('productId', '')).strip()}"
-            name = str(p.get("productName", "")).strip()
-            quota = str(p.get("quota", "")).strip() or "-"
-            total = str(p.get("total_", "")).strip()
-            parts.append(f"{pid}#{name}({quota})#{total}")
-        final = "".join(parts)
-        response_str = f"trxid={trxid}&to={to}&status=success&message=listpaket in {category} : {final}"
-        self.logger.debug("Response string created", response=response_str)
         return response_str
-
-    def get_stats(self) -> dict:
-        """Return info seperti total char dan produk sebelum/sesudah proses."""
-        return self._stats
@@ -0,0 +1,164 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+from src.interfaces.ireq_forwarder import IRequestForwarder
+from src.mlogger import logger
+from src.schemas.catalog_snapshot import CatalogSnapshot
+
+_MISSING = object()
+
+
+def msisdn_prefix(value: str, length: int) -> str:
+    """Return the first `length` digits of a number in local `08...` form.
+
+    `+62812...` / `62812...` / `0812-...` semua jadi `0812...`, supaya
+    pelanggan dengan prefix operator yang sama berbagi satu cache entry.
+    """
+    digits = "".join(ch for ch in str(value) if ch.isdigit())
+    if digits.startswith("62"):
+        digits = "0" + digits[2:]
+    return digits[:length]
+
+
+def build_request_key(
+    endpoint: str,
+    query_params: dict,
+    exclude: Iterable[str] = ("trxid",),
+    to_prefix_length: int | None = None,
+) -> tuple:
+    """Normalize an upstream call into a hashable key, ignoring volatile params.
+
+    Dengan `to_prefix_length`, param `to` hanya ikut sebagai prefix nomornya
+    (catalog sama untuk satu prefix operator), None = nomor lengkap.
+    """
+    excluded = set(exclude)
+    params = []
+    for k, v in query_params.items():
+        if k in excluded:
+            continue
+        if k == "to" and to_prefix_length:
+            v = msisdn_prefix(v, to_prefix_length)
+        params.append((k, str(v)))
+    return (endpoint.strip("/"), tuple(sorted(params)))
+
+
+class TTLCache:
+    """In-process cache with per-entry TTL and LRU eviction when full.
+
+    Tidak thread-safe; cukup untuk dipakai di satu event loop.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (self._clock() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SnapshotCache(TTLCache):
+    """TTLCache of CatalogSnapshot, keyed like the upstream response cache.
+
+    Snapshot hanya valid selama dibuat dari object response upstream yang
+    sama; kalau response cache sudah refresh, snapshot lama dianggap basi.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stale = 0
+
+    def lookup(self, key: Hashable, source: Any) -> CatalogSnapshot | None:
+        snapshot = self.get(key)
+        if snapshot is not None and snapshot.source is not source:
+            self.hits -= 1
+            self.misses += 1
+            self.stale += 1
+            return None
+        return snapshot
+
+    def stats(self) -> dict:
+        return {**super().stats(), "stale": self.stale}
+
+
+class CachedRequestForwarder(IRequestForwarder):
+    """Serves repeated upstream lookups from a TTLCache in front of another forwarder.
+
+    Hanya response sukses yang di-cache. Response yang di-cache dipakai bersama
+    oleh banyak request, jadi caller tidak boleh memodifikasinya.
+    """
+
+    def __init__(
+        self,
+        inner: IRequestForwarder,
+        cache: TTLCache,
+        exclude_params: Iterable[str] = ("trxid",),
+        to_prefix_length: int | None = None,
+    ):
+        self.inner = inner
+        self.cache = cache
+        self.exclude_params = tuple(exclude_params)
+        self.to_prefix_length = to_prefix_length
+        self.logger = logger.bind(class_name="CachedRequestForwarder")
+
+    async def forward(self, endpoint: str, query_params: dict) -> dict:
+        key = build_request_key(
+            endpoint, query_params, self.exclude_params, self.to_prefix_length
+        )
+        data = self.cache.get(key, _MISSING)
+        if data is not _MISSING:
+            self.logger.debug("Cache hit", endpoint=endpoint)
+            return data
+        self.logger.debug("Cache miss", endpoint=endpoint)
+        data = await self.inner.forward(endpoint, query_params)
+        self.cache.set(key, data)
+        return data
@@ -0,0 +1,70 @@
+import random
+from dataclasses import dataclass
+
+import httpx
+
+from src.config.mod_settings import ModuleConfig
+
+DEFAULT_RETRY_ON_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Retry rules for upstream calls: what to retry, how long to wait, and when to give up.
+
+    Backoff pakai exponential + full jitter: delay attempt ke-n adalah random
+    antara 0 dan min(backoff_max, backoff_base * 2**(n-1)). Semua attempt dan
+    jeda dibatasi oleh `total_deadline` (kalau diset).
+    """
+
+    max_attempts: int = 2
+    timeout: float = 10.0
+    backoff_base: float = 2.0
+    backoff_max: float = 10.0
+    jitter: bool = True
+    total_deadline: float | None = None
+    retry_on_status: frozenset[int] = DEFAULT_RETRY_ON_STATUS
+    retry_methods: frozenset[str] = IDEMPOTENT_METHODS
+
+    @classmethod
+    def from_module_config(cls, module_cfg: ModuleConfig) -> "RetryPolicy":
+        """Build the policy from the timeout/retry fields of a module."""
+        return cls(
+            max_attempts=max(1, module_cfg.max_retries),
+            timeout=float(module_cfg.timeout),
+            backoff_base=float(max(0, module_cfg.seconds_between_retries)),
+            backoff_max=module_cfg.backoff_max_seconds,
+            jitter=module_cfg.retry_jitter,
+            total_deadline=module_cfg.total_deadline_seconds,
+            retry_on_status=frozenset(module_cfg.retry_on_status),
+        )
+
+    @classmethod
+    def from_dict(cls, config: dict) -> "RetryPolicy":
+        """Build the policy from a legacy `config` dict (timeout, max_retries, ...)."""
+        return cls(
+            max_attempts=max(1, config.get("max_retries", 2)),
+            timeout=float(config.get("timeout", 10)),
+            backoff_base=float(config.get("seconds_between_retries", 2)),
+        )
+
+    def allows_retry(self, method: str) -> bool:
+        """Non-idempotent methods (POST, PATCH) are never retried."""
+        return method.upper() in self.retry_methods
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.retry_on_status
+
+    def is_retryable_exception(self, exc: BaseException) -> bool:
+        """Network errors and timeouts are retryable; everything else is not."""
+        if isinstance(exc, httpx.HTTPStatusError):
+            return self.is_retryable_status(exc.response.status_code)
+        return isinstance(exc, httpx.TransportError)
+
+    def backoff(self, attempt: int) -> float:
+        """Delay (seconds) to wait after the given failed attempt (1-based)."""
+        if self.backoff_base <= 0:
+            return 0.0
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
@@ -0,0 +1,99 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Iterable
+from typing import Any, TypeVar
+
+from src.interfaces.ireq_forwarder import IRequestForwarder
+from src.mlogger import logger
+from src.schemas.upstream import ByteMeter
+from src.services.resp_cache import build_request_key
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one shared in-flight task.
+
+    - Error dari task dibagikan ke semua caller yang menunggu.
+    - Caller yang di-cancel hanya berhenti menunggu; task tetap jalan selama
+      masih ada caller lain. Kalau semua caller pergi, task ikut di-cancel.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn()` once per key; concurrent callers await the same result."""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                self._forget(key, call)
+                call.task.cancel()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
+
+
+class CoalescingRequestForwarder(IRequestForwarder):
+    """Shares one upstream call between identical concurrent requests.
+
+    Request dianggap identik kalau endpoint dan params (tanpa `trxid`) sama.
+    """
+
+    def __init__(
+        self,
+        inner: IRequestForwarder,
+        single_flight: SingleFlight | None = None,
+        exclude_params: Iterable[str] = ("trxid",),
+    ):
+        self.inner = inner
+        self.single_flight = single_flight or SingleFlight()
+        self.exclude_params = tuple(exclude_params)
+        self.logger = logger.bind(class_name="CoalescingRequestForwarder")
+
+    async def forward(self, endpoint: str, query_params: dict) -> dict:
+        key = build_request_key(endpoint, query_params, self.exclude_params)
+        return await self.single_flight.do(
+            key, lambda: self.inner.forward(endpoint, query_params)
+        )
+
+    def stream_items(
+        self,
+        endpoint: str,
+        query_params: dict,
+        key: str = "paket",
+        meter: ByteMeter | None = None,
+    ) -> AsyncIterator[Any]:
+        """Streams are not shareable between callers, so they bypass coalescing."""
+        return self.inner.stream_items(endpoint, query_params, key, meter)
@@ -0,0 +1,169 @@
+import re
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+
+from src.mlogger import logger
+from src.schemas.catalog_snapshot import CatalogSnapshot, pack_pages, render_fragment
+from src.schemas.paket_record import PaketRecord
+from src.services.quota_pipeline import QuotaPipeline
+
+# singkatan default untuk strategi "abbreviate" (kata utuh, case-insensitive)
+DEFAULT_ABBREVIATIONS = {
+    "INTERNET": "INET",
+    "UNLIMITED": "UNL",
+    "NASIONAL": "NAS",
+    "BULANAN": "BLN",
+    "MINGGUAN": "MGG",
+    "HARIAN": "HRN",
+    "TELEPON": "TLP",
+    "TELPON": "TLP",
+    "KUOTA": "KTA",
+    "LOKAL": "LOK",
+}
+
+# urutan strategi compaction yang dicoba. Bukan urutan tingkat kerusakan:
+# "regex" memakai pola module dan bisa menghapus isi quota, jadi hanya aktif
+# kalau module mengisi list_regex_replacement sendiri
+STRATEGIES = ("none", "regex", "abbreviate", "drop_columns", "paginate")
+
+RecordTransform = Callable[[PaketRecord], PaketRecord]
+
+
+@dataclass(frozen=True, slots=True)
+class BudgetResult:
+    """Message(s) fitted into the budget and the strategy that made them fit."""
+
+    messages: tuple[str, ...]
+    strategy: str
+
+    @property
+    def pages(self) -> int:
+        return len(self.messages)
+
+
+class _Level:
+    __slots__ = ("fragments", "name", "size")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.fragments: list[str] = []
+        self.size = 0
+
+
+class BudgetRenderer:
+    """Fits the /listpaket message into a character budget.
+
+    Strategi dicoba berurutan dan bersifat kumulatif (regex -> abbreviate ->
+    drop_columns); semua level di-render dalam satu pass per paket, lalu
+    dipilih level pertama yang muat. Kalau tetap tidak muat, fragment level
+    terakhir dipecah jadi beberapa message (paginate). Hasil render per level
+    disimpan di CatalogSnapshot, jadi snapshot yang di-cache tidak dihitung ulang.
+    """
+
+    def __init__(
+        self,
+        max_chars: int,
+        pipeline: QuotaPipeline | None = None,
+        abbreviations: Mapping[str, str] | None = None,
+        drop_columns: Iterable[str] = ("quota",),
+    ):
+        self.max_chars = max_chars
+        self.drop_columns = frozenset(drop_columns)
+        self.levels: list[tuple[str, RecordTransform]] = []
+        if pipeline is not None and pipeline.patterns:
+            self.levels.append(("regex", self._regex_transform(pipeline)))
+        abbreviations = {k.upper(): v for k, v in (abbreviations or {}).items()}
+        if abbreviations:
+            self.levels.append(("abbreviate", self._abbrev_transform(abbreviations)))
+        if self.drop_columns:
+            self.levels.append(("drop_columns", self._drop_transform()))
+        self._memo_key = ("budget", id(self))
+        self.logger = logger.bind(class_name="BudgetRenderer")
+
+    @staticmethod
+    def _regex_transform(pipeline: QuotaPipeline) -> RecordTransform:
+        def apply(r: PaketRecord) -> PaketRecord:
+            quota = pipeline.apply(r.quota) if r.quota else r.quota
+            return PaketRecord(r.product_id, r.product_name, quota, r.total)
+
+        return apply
+
+    @staticmethod
+    def _abbrev_transform(abbreviations: dict[str, str]) -> RecordTransform:
+        words = sorted(abbreviations, key=len, reverse=True)
+        regex = re.compile(
+            r"\b(?:" + "|".join(map(re.escape, words)) + r")\b", re.IGNORECASE
+        )
+
+        def sub(text: str) -> str:
+            return regex.sub(lambda m: abbreviations[m.group(0).upper()], text)
+
+        def apply(r: PaketRecord) -> PaketRecord:
+            return PaketRecord(r.product_id, sub(r.product_name), sub(r.quota), r.total)
+
+        return apply
+
+    def _drop_transform(self) -> RecordTransform:
+        drop_name = "product_name" in self.drop_columns
+        drop_quota = "quota" in self.drop_columns
+
+        def apply(r: PaketRecord) -> PaketRecord:
+            return PaketRecord(
+                r.product_id,
+                "" if drop_name else r.product_name,
+                "" if drop_quota else r.quota,
+                r.total,
+            )
+
+        return apply
+
+    def _compacted_levels(self, snapshot: CatalogSnapshot) -> list[_Level]:
+        """Render every compaction level in one pass over the snapshot records."""
+        levels = snapshot.memo.get(self._memo_key)
+        if levels is not None:
+            return levels
+        levels = [_Level(name) for name, _ in self.levels]
+        transforms = [transform for _, transform in self.levels]
+        for record in snapshot.records:
+            for level, transform in zip(levels, transforms, strict=True):
+                record = transform(record)
+                fragment = render_fragment(record, snapshot.columns)
+                level.fragments.append(fragment)
+                level.size += len(fragment)
+        snapshot.memo[self._memo_key] = levels
+        return levels
+
+    def fits(self, snapshot: CatalogSnapshot, header: str, reserve: int = 0) -> bool:
+        """Return True if `header + body` already fits without compaction.
+
+        `reserve` = karakter yang dipakai di luar message (misal prefix `info=`).
+        """
+        if self.max_chars <= 0:
+            return True
+        return reserve + len(header) + snapshot.body_size <= self.max_chars
+
+    def render(
+        self, snapshot: CatalogSnapshot, header: str, reserve: int = 0
+    ) -> BudgetResult:
+        """Return `header + body` fitted into `max_chars - reserve`, paginating as last resort."""
+        if self.fits(snapshot, header, reserve):
+            return BudgetResult((header + snapshot.body(),), "none")
+        room = max(1, self.max_chars - reserve - len(header))
+        fragments = snapshot.fragments
+        for level in self._compacted_levels(snapshot):
+            if level.size <= room:
+                return BudgetResult((header + "".join(level.fragments),), level.name)
+            fragments = level.fragments
+        pages = self.paginate(fragments, room)
+        self.logger.info(
+            "Message paginated", pages=len(pages), max_chars=self.max_chars
+        )
+        return BudgetResult(tuple(header + page for page in pages), "paginate")
+
+    @staticmethod
+    def paginate(fragments: Sequence[str], room: int) -> list[str]:
+        """Greedily pack fragments into pages of at most `room` characters."""
+        return [
+            "".join(fragments[start:end])
+            for start, end in pack_pages(fragments, max_chars=room)
+        ]
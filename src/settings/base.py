@@ -1,7 +1,14 @@
+# ruff: noqa ARG003
 from functools import lru_cache
+from typing import Any
 
-from pydantic import BaseModel, Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import BaseModel, Field, model_validator
+from pydantic_settings import (
+    BaseSettings,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+    TomlConfigSettingsSource,
+)
 
 
 class RequestConfig(BaseModel):
@@ -33,15 +40,50 @@ class GlobalResponseConfig(BaseModel):
 
 class BussinessConfig(BaseSettings):
     request: RequestConfig
-    response: GlobalResponseConfig
-    response_digipos: ProviderResponseConfig = Field(alias="response_digipos")
-    response_isimple: ProviderResponseConfig = Field(alias="response_isimple")
-    accounts: dict[str, list[Account]]
+    response_global: GlobalResponseConfig
+    response_providers: dict[str, ProviderResponseConfig] = Field(default_factory=dict)
+    accounts: dict[str, list[Account]] = Field(default_factory=dict)
 
     model_config = SettingsConfigDict(
         toml_file="secrets/config.toml", env_file_encoding="utf-8"
     )
 
+    @model_validator(mode="before")
+    @classmethod
+    def _normalize_sections(cls, data: Any) -> Any:
+        """Map TOML sections onto the fields.
+
+        - key `config.<field>` (dipakai saat instansiasi manual) menang atas TOML
+        - `[response]` dipisah jadi field global dan sub-table `[response.<provider>]`
+        """
+        if not isinstance(data, dict):
+            return data
+        data = dict(data)
+        for key in [k for k in data if k.startswith("config.")]:
+            data[key.removeprefix("config.")] = data.pop(key)
+        response = data.pop("response", None)
+        if isinstance(response, dict):
+            data.setdefault(
+                "response_global",
+                {k: v for k, v in response.items() if not isinstance(v, dict)},
+            )
+            data.setdefault(
+                "response_providers",
+                {k: v for k, v in response.items() if isinstance(v, dict)},
+            )
+        return data
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        return (init_settings, TomlConfigSettingsSource(settings_cls))
+
 
 @lru_cache
 def get_bussiness_config() -> BussinessConfig:
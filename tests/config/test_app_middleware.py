@@ -0,0 +1,49 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.config.app_middleware import setup_logger_binding
+from src.mlogger import current_request_id, logger, new_request_id
+
+
+def make_client(records):
+    app = FastAPI()
+    setup_logger_binding(app)
+
+    @app.get("/ping")
+    async def ping():
+        logger.info("ping")
+        return {"request_id": current_request_id()}
+
+    handler_id = logger.add(lambda m: records.append(m.record["extra"]), level="INFO")
+    return TestClient(app), handler_id
+
+
+def test_request_id_generated_and_logged():
+    records = []
+    client, handler_id = make_client(records)
+    try:
+        resp = client.get("/ping")
+    finally:
+        logger.remove(handler_id)
+    request_id = resp.headers["x-request-id"]
+    assert resp.json() == {"request_id": request_id}
+    assert {"request_id": request_id, "path": "/ping"} in records
+    assert current_request_id() is None
+
+
+def test_incoming_request_id_is_propagated():
+    records = []
+    client, handler_id = make_client(records)
+    try:
+        resp = client.get("/ping", headers={"X-Request-ID": "abc-123"})
+        invalid = client.get("/ping", headers={"X-Request-ID": "bad id\n"})
+    finally:
+        logger.remove(handler_id)
+    assert resp.headers["x-request-id"] == "abc-123"
+    assert resp.json() == {"request_id": "abc-123"}
+    assert invalid.headers["x-request-id"] != "bad id\n"
+
+
+def test_new_request_id_is_unique_and_increasing():
+    first, second = new_request_id(), new_request_id()
+    prefix, counter = first.rsplit("-", 1)
+    assert second == f"{prefix}-{int(counter, 16) + 1:x}"
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+from src.config.mod_settings import ModuleConfig
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip `performance` tests (wall-clock benchmarks) unless asked for.
+
+    Jalankan dengan `RUN_PERFORMANCE_TESTS=1` atau `-m performance`; di run
+    default (CI) timing tidak stabil jadi benchmark tidak ikut.
+    """
+    if os.getenv("RUN_PERFORMANCE_TESTS") == "1" or "performance" in (
+        config.getoption("markexpr") or ""
+    ):
+        return
+    skip = pytest.mark.skip(
+        reason="benchmark; set RUN_PERFORMANCE_TESTS=1 or use -m performance"
+    )
+    for item in items:
+        if "performance" in item.keywords:
+            item.add_marker(skip)
+
+
+class FakeClock:
+    """Manual clock for code that takes a `clock` callable; set `now` to advance."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def module_cfg():
+    """Factory of ModuleConfig with the required fields filled in.
+
+    Default base_url = `http://<name>.test`, jadi tiap module punya upstream
+    (dan circuit breaker) sendiri. Field lain bisa di-override per test.
+    """
+
+    def _make(name: str = "digipos", **overrides) -> ModuleConfig:
+        data = {
+            "name": name,
+            "base_url": f"http://{name}.test",
+            "timeout": 5,
+            "max_retries": 1,
+            "seconds_between_retries": 0,
+            "replace_with_regex": False,
+            "exclude_product": False,
+        }
+        data.update(overrides)
+        return ModuleConfig(**data)
+
+    return _make
@@ -0,0 +1,15 @@
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from src.dependencies.req_depends import get_module_registry
+
+
+def test_registry_must_come_from_lifespan():
+    app = FastAPI()
+
+    @app.get("/probe")
+    async def probe(registry=Depends(get_module_registry)):
+        return {"ok": registry is not None}
+
+    resp = TestClient(app).get("/probe")
+    assert resp.status_code == 503
+    assert not hasattr(app.state, "module_registry")
@@ -0,0 +1,26 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.router.diagnostics import router
+from src.services.module_registry import ModuleRegistry
+
+
+def test_upstream_diagnostics_reports_breakers(module_cfg):
+    registry = ModuleRegistry()
+    registry.start(
+        {
+            "digipos": module_cfg("digipos", circuit_breaker=True),
+            "tsel": module_cfg("tsel"),
+        }
+    )
+    registry.get("digipos").breaker.record(0.1, ok=False)
+    app = FastAPI()
+    app.include_router(router)
+    app.state.module_registry = registry
+
+    body = TestClient(app).get("/diagnostics/upstream").json()
+
+    digipos = body["modules"]["digipos"]
+    assert digipos["circuit"]["state"] == "closed"
+    assert digipos["circuit"]["failure_rate"] == 1.0
+    assert body["modules"]["tsel"]["circuit"] is None
+    assert [b["base_url"] for b in body["breakers"]] == ["http://digipos.test"]
@@ -0,0 +1,240 @@
+import json
+import os
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.interfaces.ireq_forwarder import IRequestForwarder
+from src.router.listpaket import router
+from src.schemas.upstream import UpstreamResponse
+from src.services.module_registry import ModuleRegistry
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "HVCDATA.json")
+RAW_SIZE = os.path.getsize(DATA_PATH)
+
+
+class FakeForwarder(IRequestForwarder):
+    def __init__(self, payload):
+        self.payload = UpstreamResponse(payload, raw_size=RAW_SIZE)
+        self.calls = []
+
+    async def forward(self, endpoint, query_params):
+        self.calls.append((endpoint, query_params))
+        return self.payload
+
+    async def stream_items(self, endpoint, query_params, key="paket", meter=None):
+        self.calls.append((endpoint, query_params))
+        for item in self.payload[key]:
+            yield item
+        meter.bytes = RAW_SIZE
+
+
+@pytest.fixture
+def payload():
+    with open(DATA_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def make_client(payload, module_cfg):
+    def _make(**overrides):
+        data = {
+            "replace_with_regex": True,
+            "exclude_product": True,
+            "list_prefixes": ["Facebook"],
+        }
+        data.update(overrides)
+        registry = ModuleRegistry()
+        forwarder = FakeForwarder(payload)
+        registry.build_forwarder = lambda *_: forwarder
+        registry.start({"digipos": module_cfg(**data)})
+        app = FastAPI()
+        app.include_router(router)
+        app.state.module_registry = registry
+        return TestClient(app), forwarder
+
+    return _make
+
+
+PARAMS = {"mod": "digipos", "end": "list_paket", "to": "081295221639", "trxid": "T1"}
+
+
+def test_listpaket_returns_info_and_message(make_client, payload):
+    client, forwarder = make_client()
+    resp = client.get("/listpaket", params={**PARAMS, "category": "HVC"})
+    assert resp.status_code == 200
+    info, message = resp.text.split("&", 1)
+    assert info.startswith(
+        f"info=before:(char={RAW_SIZE}|list={len(payload['paket'])})"
+    )
+    assert info.endswith(f"after:(char={len(message)}|list={message.count('@')})")
+    assert message.startswith(
+        "trxid=T1&to=081295221639&status=success&message=listpaket in HVC : @"
+    )
+    assert "FACEBOOK" not in message
+    assert len(forwarder.calls) == 1
+
+
+def test_listpaket_unknown_module(make_client):
+    client, _ = make_client()
+    resp = client.get("/listpaket", params={**PARAMS, "mod": "nope"})
+    assert resp.status_code == 400
+
+
+def test_listpaket_served_from_cache(make_client):
+    client, forwarder = make_client(cache_ttl_seconds=60)
+    first = client.get("/listpaket", params=PARAMS)
+    second = client.get("/listpaket", params={**PARAMS, "trxid": "T2"})
+    assert first.status_code == second.status_code == 200
+    assert "trxid=T2&" in second.text
+    assert second.text.replace("T2", "T1") == first.text
+    assert len(forwarder.calls) == 1
+    snapshots = client.app.state.module_registry.get("digipos").snapshots
+    assert snapshots.stats()["hits"] == 1
+
+
+def test_listpaket_snapshot_only_for_pages_without_response_cache(make_client):
+    client, forwarder = make_client()
+    snapshots = client.app.state.module_registry.get("digipos").snapshots
+    client.get("/listpaket", params=PARAMS)
+    client.get("/listpaket", params=PARAMS)
+    stats = snapshots.stats()
+    assert (stats["size"], stats["misses"], stats["stale"]) == (0, 0, 0)
+    client.get("/listpaket", params={**PARAMS, "page": 1, "page_size": 10})
+    client.get("/listpaket", params={**PARAMS, "page": 2, "page_size": 10})
+    assert len(forwarder.calls) == 3
+    assert snapshots.stats()["hits"] == 1
+    assert all(snapshot.source is None for _, snapshot in snapshots._data.values())
+
+
+def test_listpaket_cache_keyed_on_full_to_by_default(make_client):
+    client, forwarder = make_client(cache_ttl_seconds=60)
+    client.get("/listpaket", params=PARAMS)
+    client.get("/listpaket", params={**PARAMS, "to": "6281299990000"})
+    assert len(forwarder.calls) == 2
+
+
+def test_listpaket_cache_shared_by_to_prefix(make_client):
+    client, forwarder = make_client(cache_ttl_seconds=60, cache_to_prefix_length=4)
+    first = client.get("/listpaket", params=PARAMS)
+    other = client.get("/listpaket", params={**PARAMS, "to": "6281299990000"})
+    assert "to=6281299990000&" in other.text
+    assert len(forwarder.calls) == 1
+    client.get("/listpaket", params={**PARAMS, "to": "085712345678"})
+    assert len(forwarder.calls) == 2
+    assert first.status_code == other.status_code == 200
+
+
+def test_listpaket_stream_parse_matches_full_parse(make_client):
+    full_client, _ = make_client()
+    stream_client, forwarder = make_client(stream_parse=True)
+    full = full_client.get("/listpaket", params=PARAMS)
+    streamed = stream_client.get("/listpaket", params=PARAMS)
+    assert streamed.status_code == 200
+    assert streamed.text == full.text
+    assert len(forwarder.calls) == 1
+
+
+def test_listpaket_stats_disabled(make_client):
+    client, _ = make_client(enable_stats=False)
+    resp = client.get("/listpaket", params=PARAMS)
+    assert resp.text.startswith("trxid=T1&to=081295221639&status=success")
+
+
+def test_listpaket_budget_reports_strategy(make_client):
+    client, _ = make_client(max_message_chars=1500)
+    resp = client.get("/listpaket", params=PARAMS)
+    info, message = resp.text.split("&", 1)
+    assert "budget:(strategy=paginate|pages=" in info
+    assert "|page=1)" in info
+    assert "\n" not in message
+    # prefix info= ikut dihitung dalam budget
+    assert len(resp.text) <= 1500
+    pages = int(info.split("|pages=", 1)[1].split("|", 1)[0])
+    assert pages > 1
+    last = client.get("/listpaket", params={**PARAMS, "page": pages})
+    assert last.status_code == 200
+    assert f"|page={pages})" in last.text
+    assert len(last.text) <= 1500
+    assert last.text.split("&", 1)[1] != message
+    resp = client.get("/listpaket", params={**PARAMS, "page": pages + 1})
+    assert resp.status_code == 400
+
+
+def test_listpaket_page_max_chars_includes_info(make_client):
+    client, _ = make_client()
+    resp = client.get("/listpaket", params={**PARAMS, "page": 2, "max_chars": 800})
+    assert resp.status_code == 200
+    assert len(resp.text) <= 800
+
+
+def test_listpaket_pages_served_from_snapshot(make_client):
+    client, forwarder = make_client()
+    first = client.get("/listpaket", params={**PARAMS, "page": 1, "page_size": 10})
+    second = client.get(
+        "/listpaket", params={**PARAMS, "trxid": "T2", "page": 2, "page_size": 10}
+    )
+    assert first.status_code == second.status_code == 200
+    assert "page:(page=1|pages=" in first.text
+    assert "page:(page=2|pages=" in second.text
+    assert second.text.split("&", 1)[1].count("@") == 10
+    assert first.text.split("@", 2)[1] != second.text.split("@", 2)[1]
+    assert len(forwarder.calls) == 1
+    assert "page" not in forwarder.calls[0][1]
+    assert "page_size" not in forwarder.calls[0][1]
+
+
+def test_listpaket_page_out_of_range(make_client):
+    client, _ = make_client()
+    resp = client.get("/listpaket", params={**PARAMS, "page": 999})
+    assert resp.status_code == 400
+
+
+@pytest.mark.parametrize("overrides", [{}, {"max_message_chars": 100_000}])
+def test_listpaket_stream_response_matches_plain(make_client, overrides):
+    plain_client, _ = make_client(**overrides)
+    stream_client, _ = make_client(
+        stream_response=True, stream_chunk_chars=256, **overrides
+    )
+    plain = plain_client.get("/listpaket", params=PARAMS)
+    streamed = stream_client.get("/listpaket", params=PARAMS)
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"].startswith("text/plain")
+    assert "content-length" not in streamed.headers
+    assert streamed.text == plain.text
+
+
+def test_listpaket_large_listing_streams_without_budget(make_client, payload):
+    # catalog 20x lebih besar dari fixture, jauh di atas budget default 7000
+    payload["paket"] = payload["paket"] * 20
+    client, _ = make_client(
+        stream_response=True, stream_chunk_chars=1024, max_message_chars=0
+    )
+    with client.stream("GET", "/listpaket", params=PARAMS) as resp:
+        body = resp.read().decode()
+    assert "content-length" not in resp.headers
+    assert len(body.split("&", 1)[1]) > 100_000
+
+
+def test_listpaket_stream_response_falls_back_when_compacted(make_client):
+    client, _ = make_client(stream_response=True, max_message_chars=1500)
+    resp = client.get("/listpaket", params=PARAMS)
+    assert "content-length" in resp.headers
+    assert "budget:(strategy=paginate" in resp.text
+
+
+def test_listpaket_kolom_projection(make_client):
+    client, forwarder = make_client(cache_ttl_seconds=60)
+    full = client.get("/listpaket", params=PARAMS).text.split("&", 1)[1]
+    resp = client.get("/listpaket", params={**PARAMS, "kolom": "productId,total_"})
+    assert resp.status_code == 200
+    message = resp.text.split("&", 1)[1]
+    fragments = message.split(" : ", 1)[1].split("@")[1:]
+    assert len(fragments) == full.count("@")
+    assert all(re.fullmatch(r"[^#()]+#\d+", f) for f in fragments)
+    # proyeksi lokal: tidak dikirim ke upstream, catalog di-cache dipakai ulang
+    assert len(forwarder.calls) == 1
+    assert "kolom" not in forwarder.calls[0][1]
+    again = client.get("/listpaket", params={**PARAMS, "kolom": "productId,total_"})
+    assert again.text == resp.text
@@ -0,0 +1,64 @@
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.config.app_middleware import setup_metrics
+from src.metrics import REGISTRY
+from src.router.metrics import router
+from src.services.module_registry import ModuleRegistry
+
+
+def sample(text, prefix):
+    return [line for line in text.splitlines() if line.startswith(prefix)]
+
+
+def test_metrics_endpoint_exports_requests_and_module_stats(module_cfg):
+    registry = ModuleRegistry()
+    registry.start(
+        {"digipos": module_cfg(cache_ttl_seconds=60, max_concurrent_requests=4)}
+    )
+    registry.get("digipos").cache.get("missing")
+    app = FastAPI()
+    setup_metrics(app)
+    app.include_router(router)
+    app.state.module_registry = registry
+    client = TestClient(app)
+
+    client.get("/metrics")
+    resp = client.get("/metrics")
+
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert sample(
+        resp.text,
+        'modparser_request_duration_seconds_count{path="/metrics",method="GET",status="200"}',
+    ) == [
+        'modparser_request_duration_seconds_count{path="/metrics",method="GET",status="200"} 1'
+    ]
+    assert (
+        'modparser_cache_misses_total{module="digipos",cache="response"} 1' in resp.text
+    )
+    assert 'modparser_admission_queue_depth{module="digipos",account=""} 0' in resp.text
+    assert "modparser_requests_in_flight 1" in resp.text
+
+
+async def test_upstream_latency_and_retries_are_recorded(module_cfg):
+    calls = 0
+
+    def handler(_request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503 if calls == 1 else 200, json={"paket": []})
+
+    registry = ModuleRegistry()
+    registry.start({"metrics_mod": module_cfg("metrics_mod", max_retries=2)})
+    forwarder = registry.get("metrics_mod").upstream
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        forwarder.client = client
+        await forwarder.forward("/listpaket", {})
+
+    text = REGISTRY.render()
+    assert 'modparser_upstream_retries_total{module="metrics_mod"} 1' in text
+    for outcome in ("ok", "error"):
+        assert (
+            "modparser_upstream_duration_seconds_count"
+            f'{{module="metrics_mod",account="default",outcome="{outcome}"}} 1'
+        ) in text
@@ -0,0 +1,61 @@
+from src.schemas.catalog_snapshot import CatalogSnapshot, pack_pages, render_fragment
+from src.schemas.paket_record import PaketRecord
+from src.services.req_response import ProcessedPakets, ResponseProcessor
+
+RECORDS = [
+    PaketRecord("2", "ZETA", "1GB", "5000"),
+    PaketRecord("1", "ALFA", "", "1000"),
+]
+
+
+def test_render_fragment():
+    assert render_fragment(RECORDS[0]) == "@2#ZETA(1GB)#5000"
+    assert render_fragment(RECORDS[1]) == "@1#ALFA(-)#1000"
+    assert render_fragment(RECORDS[0], {"product_id", "total"}) == "@2#5000"
+    assert render_fragment(RECORDS[1], {"quota"}) == "(-)"
+
+
+def test_body_keeps_upstream_order_and_caches_sorted_order():
+    snapshot = CatalogSnapshot(ProcessedPakets(RECORDS, {"product_after": 2}))
+    assert snapshot.body() == "@2#ZETA(1GB)#5000@1#ALFA(-)#1000"
+    sorted_body = snapshot.body(sort_by_name=True)
+    assert sorted_body == "@1#ALFA(-)#1000@2#ZETA(1GB)#5000"
+    assert snapshot.body(sort_by_name=True) is sorted_body
+    assert snapshot.stats == {"product_after": 2}
+
+
+def test_to_response_string_accepts_snapshot():
+    proc = ResponseProcessor()
+    snapshot = proc.build_snapshot(RECORDS)
+    assert proc.to_response_string(snapshot, "T1", "0812") == (
+        proc.to_response_string(RECORDS, "T1", "0812")
+    )
+
+
+def test_pack_pages():
+    fragments = ["aaaa", "bb", "cc", "d"]
+    assert pack_pages(fragments, max_chars=3) == [(0, 1), (1, 2), (2, 4)]
+    assert pack_pages(fragments, max_items=3) == [(0, 3), (3, 4)]
+    assert pack_pages(fragments, max_chars=6, max_items=1) == [
+        (0, 1),
+        (1, 2),
+        (2, 3),
+        (3, 4),
+    ]
+    assert pack_pages([]) == [(0, 0)]
+
+
+def test_page_ranges_are_cached():
+    snapshot = CatalogSnapshot(RECORDS)
+    ranges = snapshot.page_ranges(max_items=1)
+    assert ranges == [(0, 1), (1, 2)]
+    assert snapshot.page_ranges(max_items=1) is ranges
+    assert snapshot.page_body(*ranges[1]) == "@1#ALFA(-)#1000"
+
+
+def test_iter_chunks_and_body_size():
+    snapshot = CatalogSnapshot(RECORDS * 3)
+    chunks = list(snapshot.iter_chunks(chunk_chars=20))
+    assert "".join(chunks) == snapshot.body()
+    assert len(chunks) == 3
+    assert snapshot.body_size == len(snapshot.body())
@@ -0,0 +1,93 @@
+import json
+import os
+import re
+
+import pytest
+from src.schemas.paket_record import PaketRecord, parse_kolom
+from src.services.req_response import ResponseProcessor
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "HVCDATA.json")
+REGEXS = [r"\b(DAYS?|HARI)\b", r"(\d+)\s*GB", r"(\d+)\s*D", r"\bINTERNET\b"]
+
+
+@pytest.fixture
+def paket_list():
+    with open(DATA_PATH, encoding="utf-8") as f:
+        return json.load(f)["paket"]
+
+
+def legacy_response_string(paket_list, prefixes, regexs, trxid, to):
+    """Implementasi dict-based sebelum PaketRecord, sebagai pembanding."""
+    parts = []
+    for paket in paket_list:
+        p = {k: v.upper() if isinstance(v, str) else v for k, v in paket.items()}
+        if any(str(p.get("productName", "")).startswith(x) for x in prefixes):
+            continue
+        quota = ", ".join(
+            x
+            for x in (
+                part.split("/", 1)[1].strip() if "/" in part else part.strip()
+                for part in str(p.get("quota", "")).split(",")
+            )
+            if x
+        )
+        for regex in regexs:
+            quota = re.sub(regex, "", quota, flags=re.IGNORECASE)
+        quota = re.sub(r"\s+", " ", quota).strip() or "-"
+        parts.append(
+            f"@{p['productId']}#{p['productName'].strip()}({quota})#{p['total_']}"
+        )
+    return f"trxid={trxid}&to={to}&status=success&message=listpaket in paket : {''.join(parts)}"
+
+
+def test_from_upstream_keeps_only_needed_columns():
+    record = PaketRecord.from_upstream(
+        {"productId": "001", "productName": " Kuota ", "total_": 5875, "extra": "x"}
+    )
+    assert record == PaketRecord("001", "KUOTA", "", "5875")
+    assert record["productName"] == "KUOTA"
+    assert record.get("quota") == ""
+    assert record.get("extra", "missing") == "missing"
+    assert record.to_dict() == {
+        "productId": "001",
+        "productName": "KUOTA",
+        "quota": "",
+        "total_": "5875",
+    }
+    with pytest.raises(KeyError):
+        record["extra"]
+    assert not hasattr(record, "__dict__")
+
+
+def test_record_pipeline_matches_legacy_output(paket_list):
+    proc = ResponseProcessor(
+        exclude_product=True,
+        list_prefixes=["Facebook"],
+        replace_with_regex=True,
+        list_regex_replacement=REGEXS,
+    )
+    result = proc.to_response_string(proc.process(paket_list), "T1", "0812")
+    assert result == legacy_response_string(
+        paket_list, ["FACEBOOK"], REGEXS, "T1", "0812"
+    )
+
+
+def test_parse_kolom():
+    assert parse_kolom(None) is None
+    assert parse_kolom("productId,productName,quota,total_") is None
+    assert parse_kolom(" productid , TOTAL_ ") == {"product_id", "total"}
+
+
+def test_from_upstream_reads_only_projected_columns():
+    paket = {"productId": "p1", "productName": "kuota", "quota": "1gb", "total_": 5}
+    record = PaketRecord.from_upstream(paket, {"product_id", "total"})
+    assert record == PaketRecord("P1", "", "", "5")
+
+
+def test_process_projection_keeps_exclusion(paket_list):
+    proc = ResponseProcessor(exclude_product=True, list_prefixes=["Facebook"])
+    full = proc.process(paket_list)
+    projected = proc.process(paket_list, {"product_id", "total"})
+    assert len(projected) == len(full)
+    assert all(r.quota == "" for r in projected)
+    assert [r.product_id for r in projected] == [r.product_id for r in full]
@@ -0,0 +1,102 @@
+import httpx
+import pytest
+from src.services.account_pool import AccountPool, AccountSlot
+from src.services.module_registry import ModuleRegistry
+from src.services.req_forwarder import RequestForwarder
+from src.settings.base import Account
+
+
+def make_account(name, base_url=None, is_aktif=True):
+    return Account(
+        base_url=base_url,
+        username=name,
+        password="secret",
+        pin="1234",
+        msisdn="0811",
+        is_aktif=is_aktif,
+    )
+
+
+def test_from_accounts_skips_inactive_and_defaults_base_url():
+    pool = AccountPool.from_accounts(
+        [
+            make_account("a", "http://a.test/"),
+            make_account("b"),
+            make_account("c", is_aktif=False),
+        ],
+        "http://module.test",
+    )
+    assert [s.base_url for s in pool.slots] == ["http://a.test", "http://module.test"]
+    assert AccountPool.from_accounts([make_account("x", is_aktif=False)], "") is None
+
+
+def test_round_robin_rotates():
+    pool = AccountPool([AccountSlot("a", "http://a"), AccountSlot("b", "http://b")])
+    assert [pool.choose().name for _ in range(4)] == ["a", "b", "a", "b"]
+
+
+def test_least_outstanding_prefers_idle_slot():
+    a, b = AccountSlot("a", "http://a"), AccountSlot("b", "http://b")
+    pool = AccountPool([a, b], strategy="least_outstanding")
+    with pool.lease() as first, pool.lease() as second:
+        assert {first.name, second.name} == {"a", "b"}
+    a.in_flight = 3
+    assert pool.choose() is b
+
+
+def test_latency_ewma_prefers_fast_slot(fake_clock):
+    a, b = AccountSlot("a", "http://a"), AccountSlot("b", "http://b")
+    pool = AccountPool([a, b], strategy="latency_ewma", clock=fake_clock)
+    pool.record(a, 2.0, ok=True)
+    pool.record(b, 0.1, ok=True)
+    assert pool.choose() is b
+    pool.record(a, 0.0, ok=True)
+    assert a.latency_ewma == pytest.approx(1.4)
+
+
+def test_lease_records_failures_and_exclude(fake_clock):
+    a, b = AccountSlot("a", "http://a"), AccountSlot("b", "http://b")
+    pool = AccountPool([a, b], clock=fake_clock)
+    with pytest.raises(RuntimeError), pool.lease() as slot:
+        fake_clock.now = 0.5
+        raise RuntimeError
+    assert slot.in_flight == 0
+    assert slot.stats()["failures"] == 1
+    assert slot.latency_ewma == 0.5
+    assert all(pool.choose(exclude=a) is b for _ in range(3))
+
+
+async def test_forwarder_spreads_calls_over_accounts():
+    hosts: list[str] = []
+
+    def handler(request):
+        hosts.append(request.url.host)
+        return httpx.Response(200, json={"paket": []})
+
+    pool = AccountPool(
+        [AccountSlot("a", "http://a.test"), AccountSlot("b", "http://b.test")]
+    )
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        forwarder = RequestForwarder(
+            "http://module.test", client=client, account_pool=pool
+        )
+        for _ in range(4):
+            await forwarder.forward("/listpaket", {})
+    assert hosts == ["a.test", "b.test", "a.test", "b.test"]
+    assert [s["requests"] for s in pool.stats()] == [2, 2]
+
+
+def test_registry_builds_pool_only_when_enabled(module_cfg):
+    registry = ModuleRegistry(accounts={"digipos": [make_account("a", "http://a")]})
+    registry.start(
+        {
+            "digipos": module_cfg(
+                "digipos", use_accounts=True, account_strategy="latency_ewma"
+            ),
+            "tsel": module_cfg("tsel", use_accounts=True),
+        }
+    )
+    pool = registry.get("digipos").accounts
+    assert pool.strategy == "latency_ewma"
+    assert [s.name for s in pool.slots] == ["a"]
+    assert registry.get("tsel").accounts is None
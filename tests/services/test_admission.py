@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from src.services.account_pool import AccountPool, AccountSlot
+from src.services.admission import AdmissionLimiter, AdmissionRejectedError
+from src.services.req_forwarder import RequestForwarder
+from src.services.retry_policy import RetryPolicy
+
+
+async def test_limits_concurrency_and_queues():
+    limiter = AdmissionLimiter("digipos", max_concurrent=2, queue_timeout=1)
+    running = peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with limiter.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    stats = limiter.stats()
+    assert peak == 2
+    assert stats["admitted"] == 6
+    assert stats["queued"] == 4
+    assert stats["queue_depth"] == 0
+    assert stats["queue_depth_max"] == 4
+    assert stats["wait_seconds_max"] > 0
+
+
+async def test_sheds_when_queue_is_full_or_times_out():
+    limiter = AdmissionLimiter(
+        "digipos", max_concurrent=1, max_queue=1, queue_timeout=0.05
+    )
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(limiter.slot().__aenter__())
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejectedError, match="queue full"):
+        async with limiter.slot():
+            pass
+    with pytest.raises(AdmissionRejectedError, match="queue timeout"):
+        await waiter
+    release.set()
+    await holder
+    assert limiter.stats()["rejected"] == 1
+    assert limiter.stats()["timeouts"] == 1
+    assert limiter.in_use == 0
+
+
+def test_pool_prefers_account_with_free_slot():
+    a, b = AccountSlot("a", "http://a"), AccountSlot("b", "http://b")
+    a.limiter = AdmissionLimiter("a", max_concurrent=1)
+    a.limiter.in_use = 1
+    pool = AccountPool([a, b])
+    assert all(pool.choose() is b for _ in range(3))
+
+
+async def test_forwarder_returns_503_on_queue_timeout():
+    release = asyncio.Event()
+
+    async def handler(_request):
+        await release.wait()
+        return httpx.Response(200, json={})
+
+    limiter = AdmissionLimiter("digipos", max_concurrent=1, queue_timeout=0.01)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        forwarder = RequestForwarder(
+            "http://up.test",
+            client=client,
+            retry_policy=RetryPolicy(max_attempts=3, backoff_base=0),
+            limiter=limiter,
+        )
+        first = asyncio.create_task(forwarder.forward("/listpaket", {}))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as exc_info:
+            await forwarder.forward("/listpaket", {})
+        release.set()
+        await first
+    assert exc_info.value.status_code == 503
+    assert limiter.stats()["timeouts"] == 1
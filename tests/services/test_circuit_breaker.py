@@ -0,0 +1,95 @@
+import httpx
+import pytest
+from fastapi import HTTPException
+from src.services.account_pool import AccountPool, AccountSlot
+from src.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.services.req_forwarder import RequestForwarder
+from src.services.retry_policy import RetryPolicy
+
+
+def make_breaker(clock, **overrides):
+    options = {"window_size": 4, "min_calls": 4, "error_rate": 0.5, "open_seconds": 10}
+    options.update(overrides)
+    return CircuitBreaker("http://up.test", clock=clock, **options)
+
+
+def test_opens_on_error_rate_and_fast_fails(fake_clock):
+    breaker = make_breaker(fake_clock)
+    for ok in (True, True, False):
+        breaker.record(0.1, ok)
+    assert breaker.state == "closed"
+    breaker.record(0.1, ok=False)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError) as exc_info, breaker.guard():
+        pass
+    assert exc_info.value.retry_after == 10
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_slow_calls_count_as_failures(fake_clock):
+    breaker = make_breaker(fake_clock, slow_call_seconds=1.0)
+    for _ in range(4):
+        breaker.record(2.0, ok=True)
+    assert breaker.state == "open"
+
+
+def test_half_open_probe_closes_or_reopens(fake_clock):
+    breaker = make_breaker(fake_clock, min_calls=1)
+    breaker.record(0.1, ok=False)
+    fake_clock.now = 10
+    assert breaker.state == "half_open"
+    assert breaker.acquire()
+    # satu probe sedang jalan, call lain tetap ditolak
+    assert not breaker.available()
+    breaker.record(0.1, ok=False)
+    assert breaker.state == "open"
+    fake_clock.now = 20
+    with breaker.guard():
+        pass
+    assert breaker.state == "closed"
+
+
+def test_client_errors_do_not_trip(fake_clock):
+    breaker = make_breaker(fake_clock, min_calls=1)
+    response = httpx.Response(404, request=httpx.Request("GET", "http://up.test"))
+    error = httpx.HTTPStatusError(
+        "not found", request=response.request, response=response
+    )
+    with pytest.raises(httpx.HTTPStatusError), breaker.guard():
+        raise error
+    assert breaker.state == "closed"
+
+
+def test_open_slot_is_ejected_from_pool(fake_clock):
+    a, b = AccountSlot("a", "http://a"), AccountSlot("b", "http://b")
+    a.breaker = make_breaker(fake_clock, min_calls=1)
+    b.breaker = make_breaker(fake_clock, min_calls=1)
+    pool = AccountPool([a, b])
+    a.breaker.record(0.1, ok=False)
+    assert all(pool.choose() is b for _ in range(3))
+    b.breaker.record(0.1, ok=False)
+    with pytest.raises(CircuitOpenError):
+        pool.choose()
+
+
+async def test_forwarder_stops_retrying_once_circuit_opens():
+    calls = 0
+
+    def handler(_request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503)
+
+    breaker = CircuitBreaker("http://up.test", min_calls=2, open_seconds=30)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        forwarder = RequestForwarder(
+            "http://up.test",
+            client=client,
+            retry_policy=RetryPolicy(max_attempts=5, backoff_base=0),
+            breaker=breaker,
+        )
+        with pytest.raises(HTTPException) as exc_info:
+            await forwarder.forward("/listpaket", {})
+    assert calls == 2
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "30"
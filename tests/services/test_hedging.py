@@ -0,0 +1,127 @@
+import asyncio
+
+import httpx
+import pytest
+from src.services.account_pool import AccountPool, AccountSlot
+from src.services.hedging import Hedger
+from src.services.req_forwarder import RequestForwarder
+from src.services.retry_policy import RetryPolicy
+
+
+def warm_hedger(latency=0.01, **overrides):
+    options = {"min_delay": 0.01, "max_rate": 1.0, "min_samples": 5}
+    options.update(overrides)
+    hedger = Hedger(**options)
+    for _ in range(5):
+        hedger.observe(latency)
+    return hedger
+
+
+def test_delay_is_percentile_of_recent_latencies():
+    hedger = Hedger(percentile=90, min_delay=0.0, min_samples=10)
+    for i in range(1, 10):
+        hedger.observe(i / 10)
+    assert hedger.delay() is None
+    hedger.observe(1.0)
+    assert hedger.delay() == pytest.approx(0.9)
+    assert Hedger(min_delay=0.5, min_samples=1).delay() is None
+
+
+def test_hedge_rate_is_capped():
+    hedger = warm_hedger(max_rate=0.1)
+    allowed = 0
+    for _ in range(100):
+        hedger.begin()
+        allowed += hedger.try_hedge()
+    assert allowed == 10
+    assert hedger.stats()["throttled"] == 90
+
+
+def make_forwarder(client, hedger, pool=None):
+    return RequestForwarder(
+        "http://slow.test",
+        client=client,
+        retry_policy=RetryPolicy(max_attempts=1, timeout=5),
+        account_pool=pool,
+        hedger=hedger,
+    )
+
+
+def make_pool():
+    return AccountPool(
+        [
+            AccountSlot("slow", "http://slow.test"),
+            AccountSlot("fast", "http://fast.test"),
+        ]
+    )
+
+
+async def test_hedge_to_other_account_wins_and_loser_is_cancelled():
+    cancelled = []
+
+    async def handler(request):
+        if request.url.host == "slow.test":
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(request.url.host)
+                raise
+        return httpx.Response(200, json={"host": request.url.host})
+
+    pool = make_pool()
+    hedger = warm_hedger()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        data = await make_forwarder(client, hedger, pool).forward("/listpaket", {})
+    assert data["host"] == "fast.test"
+    assert cancelled == ["slow.test"]
+    assert hedger.hedged == hedger.hedge_wins == 1
+    assert [s.in_flight for s in pool.slots] == [0, 0]
+
+
+async def test_fast_primary_is_not_hedged():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.host)
+        return httpx.Response(200, json={})
+
+    hedger = warm_hedger(latency=1.0)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        await make_forwarder(client, hedger).forward("/listpaket", {})
+    assert calls == ["slow.test"]
+    assert hedger.hedged == 0
+
+
+async def test_failed_hedge_falls_back_to_primary():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.host)
+        if request.url.host == "slow.test":
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"winner": "primary"})
+        return httpx.Response(500)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        forwarder = make_forwarder(client, warm_hedger(), make_pool())
+        data = await forwarder.forward("/listpaket", {})
+    assert data["winner"] == "primary"
+    assert calls == ["slow.test", "fast.test"]
+
+
+@pytest.mark.parametrize("with_pool", [False, True])
+async def test_no_hedge_without_another_account(with_pool):
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.host)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={})
+
+    pool = AccountPool([AccountSlot("slow", "http://slow.test")]) if with_pool else None
+    hedger = warm_hedger()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        await make_forwarder(client, hedger, pool).forward("/listpaket", {})
+    assert calls == ["slow.test"]
+    assert hedger.hedged == 0
+    assert hedger.throttled == 0
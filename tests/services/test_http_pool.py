@@ -0,0 +1,63 @@
+import httpx
+from src.services.http_pool import HttpClientPool
+from src.services.req_forwarder import RequestForwarder
+
+
+async def test_pool_creates_one_client_per_module(module_cfg):
+    pool = HttpClientPool()
+    pool.start({"digipos": module_cfg(), "tsel": module_cfg("tsel")})
+    client = pool.get("digipos")
+    assert isinstance(client, httpx.AsyncClient)
+    assert client is not pool.get("tsel")
+    assert pool.get("unknown") is None
+    await pool.aclose()
+    assert client.is_closed
+    assert pool.get("digipos") is None
+
+
+async def test_pool_http2_falls_back_without_h2(monkeypatch, module_cfg):
+    monkeypatch.setattr("src.services.http_pool._h2_available", lambda: False)
+    client = HttpClientPool.build_client(module_cfg(http2=True))
+    assert isinstance(client, httpx.AsyncClient)
+    await client.aclose()
+
+
+async def test_forwarder_reuses_pooled_client():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"paket": []})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    forwarder = RequestForwarder("http://upstream.test/", client=client)
+    for _ in range(3):
+        assert await forwarder.forward("list_paket", {"to": "0812"}) == {"paket": []}
+    assert len(calls) == 3
+    assert str(calls[0].url) == "http://upstream.test/list_paket?to=0812"
+    # client milik pool, tidak boleh ditutup oleh forwarder
+    assert not client.is_closed
+    await client.aclose()
+
+
+async def test_pool_client_uses_module_limits(module_cfg):
+    pool = HttpClientPool()
+    pool.start(
+        {
+            "tsel": module_cfg(
+                "tsel",
+                timeout=3,
+                max_connections=7,
+                max_keepalive_connections=3,
+                keepalive_expiry=12,
+            )
+        }
+    )
+    client = pool.get("tsel")
+    # limit koneksi disimpan di connection pool transport (httpcore)
+    connections = client._transport._pool
+    assert connections._max_connections == 7
+    assert connections._max_keepalive_connections == 3
+    assert connections._keepalive_expiry == 12
+    assert client.timeout == httpx.Timeout(3)
+    await pool.aclose()
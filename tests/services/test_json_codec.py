@@ -0,0 +1,65 @@
+import json
+import os
+import timeit
+
+import pytest
+from src.mlogger import logger
+from src.services.json_codec import (
+    JsonCodec,
+    available_backends,
+    default_codec,
+    get_codec,
+)
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "HVCDATA.json")
+FAST_BACKENDS = [b for b in ("orjson", "msgspec") if b in available_backends()]
+
+
+@pytest.fixture(scope="module")
+def raw():
+    with open(DATA_PATH, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("name", available_backends())
+def test_backends_roundtrip(name, raw):
+    codec = get_codec(name)
+    assert codec.name == name
+    data = codec.loads(raw)
+    assert data == json.loads(raw)
+    assert json.loads(codec.dumps(data)) == data
+
+
+def test_unknown_backend_falls_back_to_stdlib():
+    assert type(get_codec("nope")) is JsonCodec
+
+
+def test_default_codec_from_env(monkeypatch):
+    monkeypatch.setenv("APP_JSON_BACKEND", "json")
+    assert default_codec().name == "json"
+
+
+@pytest.mark.performance
+@pytest.mark.skipif(not FAST_BACKENDS, reason="orjson/msgspec not installed")
+@pytest.mark.parametrize("name", FAST_BACKENDS)
+def test_benchmark_fast_backend_beats_stdlib(name, raw):
+    stdlib, fast = get_codec("json"), get_codec(name)
+    data = stdlib.loads(raw)
+    number = 200
+
+    def bench(codec):
+        decode = min(timeit.repeat(lambda: codec.loads(raw), number=number, repeat=5))
+        encode = min(timeit.repeat(lambda: codec.dumps(data), number=number, repeat=5))
+        return decode, encode
+
+    std_decode, std_encode = bench(stdlib)
+    fast_decode, fast_encode = bench(fast)
+    logger.info(
+        f"[{name}] HVCDATA.json x{number}: "
+        f"decode {std_decode:.4f}s -> {fast_decode:.4f}s "
+        f"({std_decode / fast_decode:.1f}x), "
+        f"encode {std_encode:.4f}s -> {fast_encode:.4f}s "
+        f"({std_encode / fast_encode:.1f}x)"
+    )
+    assert fast_decode < std_decode
+    assert fast_encode < std_encode
@@ -0,0 +1,86 @@
+import json
+import os
+
+import httpx
+import pytest
+from src.schemas.upstream import ByteMeter, UpstreamResponse
+from src.services.json_stream import JsonArrayItemScanner, iter_json_array_items
+from src.services.req_forwarder import RequestForwarder
+from src.services.retry_policy import RetryPolicy
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "HVCDATA.json")
+
+
+def read_sample():
+    with open(DATA_PATH, "rb") as f:
+        return f.read()
+
+
+async def chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+async def collect(data: bytes, size: int, key="paket"):
+    return [item async for item in iter_json_array_items(chunked(data, size), key)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 4096, 1 << 20])
+async def test_stream_matches_full_parse(size):
+    raw = read_sample()
+    assert await collect(raw, size) == json.loads(raw)["paket"]
+
+
+async def test_skips_other_fields_and_tricky_strings():
+    payload = {
+        "meta": {"paket": [1, 2], "note": 'quote " and ] } [ {'},
+        "list": [[1, 2], {"a": "\\u00e9"}],
+        "paket": [{"productName": "Kuota ñ ]}", "n": 1}, 12345, "x", None, 1.5],
+        "after": "ignored",
+    }
+    raw = json.dumps(payload, ensure_ascii=False).encode()
+    for size in (1, 3, 1000):
+        assert await collect(raw, size) == payload["paket"]
+
+
+@pytest.mark.parametrize(
+    "payload", [{"to": "0812"}, {"paket": None}, {"paket": []}, {"x": {"paket": [1]}}]
+)
+async def test_missing_or_empty_array(payload):
+    assert await collect(json.dumps(payload).encode(), 2) == []
+
+
+async def test_truncated_array_raises():
+    raw = b'{"paket": [{"a": 1}, {"b": 2'
+    with pytest.raises(ValueError):
+        await collect(raw, 4)
+
+
+def test_scanner_buffer_stays_small():
+    raw = read_sample().decode()
+    scanner = JsonArrayItemScanner()
+    peak = 0
+    for i in range(0, len(raw), 256):
+        list(scanner.feed(raw[i : i + 256]))
+        peak = max(peak, len(scanner._buffer))
+    assert peak < 1024
+
+
+async def test_forwarder_stream_items():
+    raw = read_sample()
+
+    def handler(_request):
+        return httpx.Response(200, content=chunked(raw, 100))
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    forwarder = RequestForwarder(
+        "http://upstream.test", client=client, retry_policy=RetryPolicy()
+    )
+    meter = ByteMeter()
+    items = [item async for item in forwarder.stream_items("list", {}, meter=meter)]
+    assert items == json.loads(raw)["paket"]
+    assert meter.bytes == len(raw)
+    resp = await forwarder.forward("list", {})
+    assert isinstance(resp, UpstreamResponse)
+    assert resp.raw_size == len(raw)
+    await client.aclose()
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import os
+
+from src.schemas.catalog_snapshot import CatalogSnapshot
+from src.schemas.paket_record import PaketRecord
+from src.services.module_registry import DEFAULT_REGEX_REPLACEMENT, ModuleRegistry
+from src.services.req_response import ProcessedPakets
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "HVCDATA.json")
+
+
+# pemrosesan paket aktif, supaya processor punya regex, exclusion dan memo
+PROCESSING = {
+    "replace_with_regex": True,
+    "exclude_product": True,
+    "list_prefixes": ["Facebook"],
+}
+
+
+def test_registry_builds_services_once(module_cfg):
+    registry = ModuleRegistry()
+    registry.start({"digipos": module_cfg(max_retries=2), "tsel": module_cfg("tsel")})
+    services = registry.get("digipos")
+    assert services is registry.get("digipos")
+    assert services.forwarder is not registry.get("tsel").forwarder
+    assert services.upstream.retry_policy.max_attempts == 2
+    assert services.processor.regexs_replacement == DEFAULT_REGEX_REPLACEMENT
+    assert "digipos" in registry
+    assert registry.get("unknown") is None
+
+
+async def test_shared_processor_returns_stats_per_call(module_cfg):
+    with open(DATA_PATH, encoding="utf-8") as f:
+        paket = json.load(f)["paket"]
+    registry = ModuleRegistry()
+    registry.start({"digipos": module_cfg(**PROCESSING)})
+    processor = registry.get("digipos").processor
+
+    async def run(items):
+        await asyncio.sleep(0)
+        return processor.process(items)
+
+    full, small = await asyncio.gather(run(paket), run(paket[:3]))
+    assert isinstance(full, ProcessedPakets)
+    assert full.stats["product_before"] == len(paket)
+    assert small.stats["product_before"] == 3
+    assert small.stats["product_after"] == len(small)
+
+
+def test_configured_method_is_opt_in(module_cfg):
+    registry = ModuleRegistry()
+    registry.start(
+        {
+            "tsel": module_cfg("tsel", method="POST"),
+            "post": module_cfg("post", method="post", use_configured_method=True),
+        }
+    )
+    tsel = registry.get("tsel").upstream
+    assert tsel.method == "GET"
+    assert tsel.retry_policy.allows_retry(tsel.method)
+    assert registry.get("post").upstream.method == "POST"
+
+
+def test_budget_without_module_patterns_keeps_quota(module_cfg):
+    registry = ModuleRegistry(default_max_chars=7000)
+    registry.start({"tsel": module_cfg("tsel", list_regex_replacement=[])})
+    budget = registry.get("tsel").budget
+    snapshot = CatalogSnapshot(
+        [
+            PaketRecord(str(i), "Paket", "INTERNET 3 DAYS 1 GB NASIONAL", "5")
+            for i in range(190)
+        ]
+    )
+    header = "trxid=T1&to=0812&status=success&message=listpaket in paket : "
+    assert len(header) + snapshot.body_size > budget.max_chars
+    result = budget.render(snapshot, header)
+    assert result.strategy == "abbreviate"
+    assert "(INET 3 DAYS 1 GB NAS)" in result.messages[0]
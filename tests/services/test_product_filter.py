@@ -0,0 +1,58 @@
+import pytest
+from src.services.product_filter import ProductExcluder
+from src.services.req_response import ResponseProcessor
+
+
+def test_empty_excluder_is_falsy():
+    excluder = ProductExcluder(prefixes=["", "  "])
+    assert not excluder
+    assert not excluder.matches("FACEBOOK 1GB")
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("facebook 1gb", True),
+        ("Instagram Harian", True),
+        ("KUOTA MALAM", True),
+        ("PAKET WA SPESIAL", True),
+        ("Combo Sakti 10GB", True),
+        ("COMBO SAKTI 10MB", False),
+        ("INTERNET OMG", False),
+    ],
+)
+def test_rules_are_case_insensitive(name, expected):
+    excluder = ProductExcluder(
+        prefixes=["Facebook", "instagram"],
+        suffixes=["malam"],
+        contains=[" wa "],
+        patterns=[r"\d+GB$"],
+    )
+    assert excluder.matches(name) is expected
+
+
+def test_contains_is_literal():
+    excluder = ProductExcluder(contains=["1.5GB"])
+    assert excluder.matches("PROMO 1.5GB")
+    assert not excluder.matches("PROMO 125GB")
+
+
+def test_prefixes_are_deduplicated_in_order():
+    excluder = ProductExcluder(prefixes=["wa", "Facebook", "WA "])
+    assert excluder.prefixes == ("WA", "FACEBOOK")
+
+
+def test_processor_applies_all_rules():
+    proc = ResponseProcessor(
+        exclude_product=True,
+        list_prefixes=["Facebook"],
+        list_suffixes=["Malam"],
+        list_exclude_regex=[r"^TEST\b"],
+    )
+    items = [
+        {"productName": "Facebook 1GB"},
+        {"productName": "Kuota Malam"},
+        {"productName": "Test Paket"},
+        {"productName": "Combo Sakti"},
+    ]
+    assert [p.product_name for p in proc.process(items)] == ["COMBO SAKTI"]
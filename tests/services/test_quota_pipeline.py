@@ -0,0 +1,92 @@
+import json
+import os
+import re
+
+import pytest
+from src.services.quota_pipeline import (
+    QuotaMemo,
+    QuotaPipeline,
+    can_fuse,
+    get_quota_pipeline,
+)
+from src.services.req_response import ResponseProcessor
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "HVCDATA.json")
+DEFAULT_REGEXS = (r"\b(DAYS?|HARI)\b", r"(\d+)\s*GB", r"(\d+)\s*D", r"\bINTERNET\b")
+
+
+@pytest.fixture
+def quotas():
+    with open(DATA_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    proc = ResponseProcessor()
+    return [proc.clean_quota_parts(p["quota"].upper()) for p in data["paket"]]
+
+
+def legacy_simplify(quota, patterns):
+    for regex in patterns:
+        quota = re.sub(regex, "", quota, flags=re.IGNORECASE)
+    return re.sub(r"\s+", " ", quota).strip()
+
+
+def test_sequential_pipeline_matches_legacy(quotas):
+    pipeline = QuotaPipeline(DEFAULT_REGEXS)
+    assert not pipeline.fused
+    for quota in quotas:
+        assert pipeline.apply(quota) == legacy_simplify(quota, DEFAULT_REGEXS)
+
+
+def test_fused_pipeline_single_pass(quotas):
+    patterns = (r"\bNASIONAL\b", r"\bVIDEO\b", r"\bMM\b")
+    pipeline = QuotaPipeline(patterns, fuse=True)
+    assert pipeline.fused
+    assert len(pipeline.compiled) == 1
+    for quota in quotas:
+        assert pipeline.apply(quota) == legacy_simplify(quota, patterns)
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [(r"(A)\1", r"B"), (r"(?P<x>A)(?P=x)", r"B"), (r"(?i)abc", r"B"), (r"A",)],
+)
+def test_unsafe_patterns_are_not_fused(patterns):
+    assert not can_fuse(patterns)
+    assert not QuotaPipeline(patterns, fuse=True).fused
+
+
+def test_pipeline_cached_per_config():
+    assert get_quota_pipeline(DEFAULT_REGEXS) is get_quota_pipeline(DEFAULT_REGEXS)
+    assert get_quota_pipeline(DEFAULT_REGEXS) is not get_quota_pipeline(
+        DEFAULT_REGEXS, fuse=True
+    )
+    proc = ResponseProcessor(
+        replace_with_regex=True, list_regex_replacement=list(DEFAULT_REGEXS)
+    )
+    assert proc.pipeline is get_quota_pipeline(DEFAULT_REGEXS)
+
+
+def test_quota_memo_hits_and_matches_uncached():
+    with open(DATA_PATH, encoding="utf-8") as f:
+        paket = json.load(f)["paket"]
+    kwargs = {
+        "replace_with_regex": True,
+        "list_regex_replacement": list(DEFAULT_REGEXS),
+    }
+    plain = ResponseProcessor(**kwargs).process(paket)
+    proc = ResponseProcessor(**kwargs, quota_memo_size=4096)
+    proc.process(paket)
+    assert proc.process(paket) == plain
+    stats = proc.quota_memo.stats()
+    assert stats["hits"] >= len(paket)
+    assert stats["size"] == len(
+        {str(p.get("quota", "")).strip().upper() for p in paket}
+    )
+
+
+def test_quota_memo_is_bounded():
+    memo = QuotaMemo(max_entries=2)
+    for i in range(3):
+        memo.set((1, str(i)), str(i))
+    assert len(memo) == 2
+    assert memo.get((1, "0")) is None
+    assert memo.stats()["evictions"] == 1
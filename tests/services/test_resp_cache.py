@@ -0,0 +1,79 @@
+from src.interfaces.ireq_forwarder import IRequestForwarder
+from src.schemas.catalog_snapshot import CatalogSnapshot
+from src.services.resp_cache import (
+    CachedRequestForwarder,
+    SnapshotCache,
+    TTLCache,
+    build_request_key,
+)
+
+
+class CountingForwarder(IRequestForwarder):
+    def __init__(self):
+        self.calls = 0
+
+    async def forward(self, *_):
+        self.calls += 1
+        return {"paket": [], "call": self.calls}
+
+
+def test_request_key_ignores_volatile_params_and_order():
+    a = build_request_key("/list_paket", {"to": "0812", "trxid": "1", "c": "X"})
+    b = build_request_key("list_paket", {"c": "X", "trxid": "2", "to": "0812"})
+    assert a == b
+    assert a != build_request_key("list_paket", {"c": "Y", "to": "0812"})
+
+
+def test_request_key_uses_to_prefix():
+    a = build_request_key("list_paket", {"to": "081295221639"}, to_prefix_length=4)
+    b = build_request_key("list_paket", {"to": "+62 812-0000"}, to_prefix_length=4)
+    assert a == b == ("list_paket", (("to", "0812"),))
+    assert a != build_request_key("list_paket", {"to": "081295221639"})
+
+
+def test_ttl_expiry(fake_clock):
+    cache = TTLCache(max_entries=4, ttl_seconds=10, clock=fake_clock)
+    cache.set("k", 1)
+    fake_clock.now = 9.9
+    assert cache.get("k") == 1
+    fake_clock.now = 10
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # a jadi most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+async def test_cached_forwarder_hits_and_misses():
+    inner = CountingForwarder()
+    cache = TTLCache(max_entries=8, ttl_seconds=60)
+    forwarder = CachedRequestForwarder(inner, cache)
+    first = await forwarder.forward("list_paket", {"to": "0812", "trxid": "1"})
+    second = await forwarder.forward("list_paket", {"to": "0812", "trxid": "2"})
+    other = await forwarder.forward("list_paket", {"to": "0813", "trxid": "3"})
+    assert first is second
+    assert other["call"] == 2
+    assert inner.calls == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_snapshot_cache_is_stale_when_source_changes():
+    cache = SnapshotCache(max_entries=4, ttl_seconds=60)
+    old, new = {"paket": []}, {"paket": []}
+    cache.set("k", CatalogSnapshot([], source=old))
+    assert cache.lookup("k", old) is not None
+    assert cache.lookup("k", new) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stale"]) == (1, 1, 1)
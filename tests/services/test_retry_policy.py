@@ -0,0 +1,98 @@
+import httpx
+import pytest
+from fastapi import HTTPException
+from src.services.req_forwarder import RequestForwarder
+from src.services.retry_policy import RetryPolicy
+
+
+def make_forwarder(handler, method="GET", **policy):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    policy.setdefault("backoff_base", 0)
+    return RequestForwarder(
+        "http://upstream.test",
+        client=client,
+        retry_policy=RetryPolicy(**policy),
+        method=method,
+    )
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(backoff_base=1, backoff_max=5, jitter=False)
+    assert [policy.backoff(n) for n in (1, 2, 3, 4)] == [1, 2, 4, 5]
+
+
+def test_backoff_jitter_stays_within_bounds():
+    policy = RetryPolicy(backoff_base=2, backoff_max=10)
+    for attempt in range(1, 6):
+        assert 0 <= policy.backoff(attempt) <= min(10, 2 * 2 ** (attempt - 1))
+
+
+def test_retryable_classification():
+    policy = RetryPolicy()
+    request = httpx.Request("GET", "http://x")
+    assert policy.is_retryable_exception(httpx.ConnectError("boom"))
+    assert policy.is_retryable_exception(httpx.ReadTimeout("slow"))
+    for status, expected in ((503, True), (429, True), (404, False), (400, False)):
+        exc = httpx.HTTPStatusError(
+            "err", request=request, response=httpx.Response(status, request=request)
+        )
+        assert policy.is_retryable_exception(exc) is expected
+    assert not policy.allows_retry("POST")
+
+
+async def test_retries_on_5xx_then_succeeds():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"paket": []})
+
+    forwarder = make_forwarder(handler, max_attempts=3)
+    assert await forwarder.forward("list", {}) == {"paket": []}
+    assert len(calls) == 3
+
+
+async def test_no_retry_on_client_error():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404)
+
+    forwarder = make_forwarder(handler, max_attempts=3)
+    with pytest.raises(HTTPException) as exc:
+        await forwarder.forward("list", {})
+    assert exc.value.status_code == 502
+    assert len(calls) == 1
+
+
+async def test_no_retry_on_non_idempotent_method():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    forwarder = make_forwarder(handler, method="POST", max_attempts=3)
+    with pytest.raises(HTTPException):
+        await forwarder.forward("list", {})
+    assert len(calls) == 1
+    assert calls[0].method == "POST"
+
+
+async def test_total_deadline_stops_retries():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("down", request=request)
+
+    forwarder = make_forwarder(
+        handler, max_attempts=5, backoff_base=1, jitter=False, total_deadline=1.5
+    )
+    with pytest.raises(HTTPException):
+        await forwarder.forward("list", {})
+    # attempt 1, sleep 1s, attempt 2, next sleep (2s) would pass the deadline
+    assert len(calls) == 2
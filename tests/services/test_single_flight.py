@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from src.interfaces.ireq_forwarder import IRequestForwarder
+from src.services.module_registry import ModuleRegistry
+from src.services.single_flight import CoalescingRequestForwarder, SingleFlight
+
+
+class SlowForwarder(IRequestForwarder):
+    def __init__(self, error=None):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.error = error
+
+    async def forward(self, endpoint, query_params):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return {"endpoint": endpoint, "to": query_params.get("to")}
+
+
+async def test_concurrent_identical_requests_share_one_call():
+    inner = SlowForwarder()
+    forwarder = CoalescingRequestForwarder(inner)
+    tasks = [
+        asyncio.create_task(forwarder.forward("list", {"to": "0812", "trxid": str(i)}))
+        for i in range(5)
+    ]
+    other = asyncio.create_task(forwarder.forward("list", {"to": "0813"}))
+    await asyncio.sleep(0)
+    inner.release.set()
+    results = await asyncio.gather(*tasks, other)
+    assert inner.calls == 2
+    assert all(r is results[0] for r in results[:5])
+    stats = forwarder.single_flight.stats()
+    assert stats == {"in_flight": 0, "leaders": 2, "coalesced": 4}
+
+
+async def test_error_is_propagated_to_all_waiters():
+    inner = SlowForwarder(error=RuntimeError("upstream down"))
+    forwarder = CoalescingRequestForwarder(inner)
+    tasks = [asyncio.create_task(forwarder.forward("list", {})) for _ in range(3)]
+    await asyncio.sleep(0)
+    inner.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert inner.calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+async def test_cancelled_waiter_does_not_cancel_others():
+    inner = SlowForwarder()
+    forwarder = CoalescingRequestForwarder(inner)
+    first = asyncio.create_task(forwarder.forward("list", {}))
+    second = asyncio.create_task(forwarder.forward("list", {}))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    inner.release.set()
+    assert await second == {"endpoint": "list", "to": None}
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_shared_call_cancelled_when_all_waiters_leave():
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def work():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    flight = SingleFlight()
+    task = asyncio.create_task(flight.do("k", work))
+    await started.wait()
+    task.cancel()
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    assert flight.in_flight() == 0
+
+
+async def test_registry_coalesces_on_full_to(module_cfg):
+    inner = SlowForwarder()
+    registry = ModuleRegistry()
+    registry.build_forwarder = lambda *_: inner
+    # prefix `to` hanya untuk response cache, bukan untuk coalescing
+    registry.start({"digipos": module_cfg(cache_to_prefix_length=4)})
+    forwarder = registry.get("digipos").forwarder
+    tasks = [
+        asyncio.create_task(forwarder.forward("list", {"to": to}))
+        for to in ("081211110000", "081222220000")
+    ]
+    await asyncio.sleep(0)
+    inner.release.set()
+    first, second = await asyncio.gather(*tasks)
+    assert inner.calls == 2
+    assert (first["to"], second["to"]) == ("081211110000", "081222220000")
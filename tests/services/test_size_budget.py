@@ -0,0 +1,97 @@
+import json
+import os
+
+import pytest
+from src.schemas.catalog_snapshot import CatalogSnapshot
+from src.schemas.paket_record import PaketRecord
+from src.services.module_registry import DEFAULT_REGEX_REPLACEMENT
+from src.services.quota_pipeline import get_quota_pipeline
+from src.services.req_response import ResponseProcessor
+from src.services.size_budget import DEFAULT_ABBREVIATIONS, BudgetRenderer
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "HVCDATA.json")
+HEADER = "trxid=T1&to=0812&status=success&message=listpaket in paket : "
+
+
+@pytest.fixture
+def snapshot():
+    with open(DATA_PATH, encoding="utf-8") as f:
+        paket = json.load(f)["paket"]
+    proc = ResponseProcessor()
+    return proc.build_snapshot(proc.process(paket))
+
+
+def make_renderer(max_chars, **kwargs):
+    kwargs.setdefault("pipeline", get_quota_pipeline(tuple(DEFAULT_REGEX_REPLACEMENT)))
+    kwargs.setdefault("abbreviations", DEFAULT_ABBREVIATIONS)
+    return BudgetRenderer(max_chars, **kwargs)
+
+
+def level_size(renderer, snapshot, name):
+    levels = renderer._compacted_levels(snapshot)
+    return next(level.size for level in levels if level.name == name)
+
+
+def test_fits_without_compaction(snapshot):
+    renderer = make_renderer(len(HEADER) + len(snapshot.body()))
+    result = renderer.render(snapshot, HEADER)
+    assert result.strategy == "none"
+    assert result.messages == (HEADER + snapshot.body(),)
+
+
+@pytest.mark.parametrize("strategy", ["regex", "abbreviate", "drop_columns"])
+def test_picks_first_strategy_that_fits(snapshot, strategy):
+    renderer = make_renderer(0)
+    renderer.max_chars = len(HEADER) + level_size(renderer, snapshot, strategy)
+    result = renderer.render(snapshot, HEADER)
+    assert result.strategy == strategy
+    assert len(result.messages[0]) <= renderer.max_chars
+
+
+def test_paginates_when_nothing_fits(snapshot):
+    renderer = make_renderer(len(HEADER) + 500)
+    result = renderer.render(snapshot, HEADER)
+    assert result.strategy == "paginate"
+    assert result.pages > 1
+    assert all(
+        m.startswith(HEADER) and len(m) <= 500 + len(HEADER) for m in result.messages
+    )
+    assert sum(m.count("@") for m in result.messages) == len(snapshot)
+
+
+def test_reserve_is_taken_from_the_budget(snapshot):
+    max_chars = len(HEADER) + len(snapshot.body())
+    renderer = make_renderer(max_chars)
+    result = renderer.render(snapshot, HEADER, reserve=200)
+    assert result.strategy != "none"
+    assert all(len(m) <= max_chars - 200 for m in result.messages)
+
+
+def test_compaction_is_memoized_on_snapshot(snapshot):
+    renderer = make_renderer(len(HEADER) + 500)
+    renderer.render(snapshot, HEADER)
+    levels = renderer._compacted_levels(snapshot)
+    assert renderer._compacted_levels(snapshot) is levels
+
+
+def test_abbreviation_and_drop_columns():
+    snapshot = CatalogSnapshot(
+        [PaketRecord("1", "Kuota Internet", "Internet 1GB", "5")]
+    )
+    renderer = BudgetRenderer(
+        1, abbreviations={"internet": "INET"}, drop_columns=["quota"]
+    )
+    levels = renderer._compacted_levels(snapshot)
+    assert [level.name for level in levels] == ["abbreviate", "drop_columns"]
+    assert levels[0].fragments == ["@1#Kuota INET(INET 1GB)#5"]
+    assert levels[1].fragments == ["@1#Kuota INET(-)#5"]
+
+
+def test_paginate_keeps_oversized_fragment_whole():
+    assert BudgetRenderer.paginate(["aaaa", "bb", "cc", "d"], 3) == [
+        "aaaa",
+        "bb",
+        "ccd",
+    ]
+    assert BudgetRenderer.paginate(["a", "b", "c"], 2) == ["ab", "c"]
+    assert BudgetRenderer.paginate([], 2) == [""]
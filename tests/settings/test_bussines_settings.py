@@ -162,3 +162,38 @@ def test_domain_specific_provider_config():
     assert spesific_cfg.list_regex_replacement == ["^abc", "xyz$"]
     assert spesific_cfg.list_product_prefixes == ["dom1", "dom2"]
     assert cfg.accounts["spesificdomain"][0].username == "domuser"
+
+
+def test_bussiness_config_loads_toml_sections(tmp_path, monkeypatch):
+    (tmp_path / "secrets").mkdir()
+    (tmp_path / "secrets" / "config.toml").write_text(
+        """
+[request]
+method = "GET"
+timeout = 10
+max_retries = 3
+seconds_between_retries = 3
+
+[response]
+min_inbound_characters = 7000
+replace_with_regex = true
+exclude_product = true
+
+[response.digipos]
+list_regex_replacement = ["abc"]
+list_product_prefixes = ["Facebook"]
+
+[[accounts.digipos]]
+username = "u"
+password = "p"
+pin = "1"
+msisdn = "62"
+is_aktif = true
+""",
+        encoding="utf-8",
+    )
+    monkeypatch.chdir(tmp_path)
+    cfg = BussinessConfig()
+    assert cfg.response_global.min_inbound_characters == 7000
+    assert cfg.response_providers["digipos"].list_product_prefixes == ["Facebook"]
+    assert cfg.accounts["digipos"][0].username == "u"
@@ -0,0 +1,53 @@
+import pytest
+from src.metrics import MetricsRegistry, render_samples
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_counter_children_are_cached(registry):
+    retries = registry.counter("retries_total", "Retries.", ("module",))
+    child = retries.labels("digipos")
+    assert retries.labels("digipos") is child
+    child.inc()
+    child.inc(2)
+    assert registry.render() == (
+        '# HELP retries_total Retries.\n# TYPE retries_total counter\nretries_total{module="digipos"} 3\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    latency = registry.histogram(
+        "latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1)
+    )
+    child = latency.labels("process")
+    for value in (0.05, 0.1, 0.5, 3):
+        child.observe(value)
+    lines = registry.render().splitlines()
+    assert lines[2:] == [
+        'latency_seconds_bucket{stage="process",le="0.1"} 2',
+        'latency_seconds_bucket{stage="process",le="1"} 3',
+        'latency_seconds_bucket{stage="process",le="+Inf"} 4',
+        'latency_seconds_sum{stage="process"} 3.65',
+        'latency_seconds_count{stage="process"} 4',
+    ]
+
+
+def test_gauge_and_label_validation(registry):
+    gauge = registry.gauge("in_flight", "In flight.")
+    child = gauge.labels()
+    child.inc()
+    child.inc()
+    child.dec()
+    assert "in_flight 1" in registry.render()
+    with pytest.raises(ValueError, match="expects labels"):
+        registry.counter("errors_total", "Errors.", ("module",)).labels()
+    with pytest.raises(ValueError, match="already registered"):
+        registry.gauge("errors_total", "Errors.")
+
+
+def test_render_samples_escapes_labels():
+    text = render_samples("up", "gauge", "Up.", [({"url": 'a"b'}, 1)])
+    assert text.splitlines()[-1] == 'up{url="a\\"b"} 1'
@@ -0,0 +1,150 @@
+import contextvars
+import os
+import time
+
+import pytest
+from src.mlogger import (
+    BufferedSink,
+    configure_payload_logging,
+    log_payload,
+    logger,
+    sample_payload_logging,
+    truncate_payload,
+)
+
+
+@pytest.fixture
+def captured():
+    messages: list[str] = []
+    handler_id = logger.add(messages.append, level="DEBUG", format="{message}")
+    yield messages
+    logger.remove(handler_id)
+
+
+@pytest.fixture(autouse=True)
+def _reset_payload_config():
+    yield
+    configure_payload_logging(max_chars=2000, sample_rate=1.0)
+
+
+class ExplodingPayload:
+    def __repr__(self):
+        raise AssertionError("payload must not be formatted")
+
+
+def test_truncate_payload():
+    assert truncate_payload("abcdef", 10) == "abcdef"
+    assert truncate_payload("abcdef", 3) == "abc... (+3 chars)"
+    assert truncate_payload("abcdef", 0) == "abcdef"
+
+
+def test_log_payload_is_not_formatted_when_level_disabled():
+    # tidak ada sink di level TRACE, jadi payload tidak boleh di-format
+    log_payload("dump", ExplodingPayload(), level="TRACE")
+
+
+def test_log_payload_truncates(captured):
+    configure_payload_logging(max_chars=5)
+    log_payload("dump", "x" * 20, formatter=str)
+    assert captured == ["dump: xxxxx... (+15 chars)\n"]
+
+
+def test_log_payload_message_with_braces(captured):
+    log_payload("endpoint {end}", [1], formatter=str)
+    assert captured == ["endpoint {end}: [1]\n"]
+
+
+def test_sampling_is_decided_per_request(captured):
+    def request(rate):
+        sample_payload_logging(rate)
+        log_payload("dump", rate, formatter=str)
+
+    contextvars.copy_context().run(request, 0.0)
+    contextvars.copy_context().run(request, 1.0)
+    assert captured == ["dump: 1.0\n"]
+
+
+class SlowStream:
+    def __init__(self):
+        self.writes: list[str] = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+def test_buffered_sink_writes_in_batches():
+    stream = SlowStream()
+    sink = BufferedSink(stream, capacity=100, batch_size=1000, flush_interval=60)
+    for i in range(10):
+        sink.write(f"{i}\n")
+    assert stream.writes == []
+    sink.stop()
+    assert stream.writes == ["".join(f"{i}\n" for i in range(10))]
+    assert sink.stats()["written"] == 10
+    assert sink.stats()["batches"] == 1
+
+
+@pytest.mark.parametrize(
+    ("policy", "kept"), [("drop_oldest", "2\n3\n4\n"), ("drop_newest", "0\n1\n2\n")]
+)
+def test_buffered_sink_drop_policy(policy, kept):
+    stream = SlowStream()
+    sink = BufferedSink(stream, capacity=3, flush_interval=60, drop_policy=policy)
+    for i in range(5):
+        sink.write(f"{i}\n")
+    sink.stop()
+    assert stream.writes == [kept]
+    assert sink.dropped == 2
+
+
+def test_buffered_sink_as_loguru_handler():
+    stream = SlowStream()
+    sink = BufferedSink(stream, flush_interval=60)
+    handler_id = logger.add(sink, level="TRACE", format="{message}")
+    logger.trace("buffered")
+    logger.remove(handler_id)
+    assert stream.writes == ["buffered\n"]
+
+
+def test_buffered_sink_accounts_for_every_record():
+    stream = SlowStream()
+    sink = BufferedSink(stream, capacity=64, batch_size=16, flush_interval=0.001)
+    for i in range(1000):
+        sink.write(f"{i}\n")
+    sink.stop()
+    assert sink.written + sink.dropped == 1000
+    assert "".join(stream.writes).count("\n") == sink.written
+
+
+@pytest.mark.performance
+def test_benchmark_buffered_sink_vs_enqueue():
+    # opt-in (RUN_PERFORMANCE_TESTS=1), perbandingan wall-clock
+    number = 5000
+
+    def bench(sink, **kwargs):
+        handler_id = logger.add(
+            sink,
+            level="TRACE",
+            format="{time} | {level} | {message}",
+            filter=lambda r: r["extra"].get("bench"),
+            **kwargs,
+        )
+        bench_logger = logger.bind(bench=True)
+        start = time.perf_counter()
+        for i in range(number):
+            bench_logger.trace("benchmark record {}", i)
+        elapsed = time.perf_counter() - start
+        logger.remove(handler_id)
+        return elapsed
+
+    with open(os.devnull, "w") as devnull:
+        enqueue = bench(devnull, enqueue=True)
+        buffered_sink = BufferedSink(devnull)
+        buffered = bench(buffered_sink)
+    logger.info(
+        f"[log sink] {number} records: enqueue {enqueue:.4f}s -> "
+        f"buffered {buffered:.4f}s ({enqueue / buffered:.1f}x), "
+        f"dropped={buffered_sink.dropped}"
+    )
+    assert buffered_sink.written + buffered_sink.dropped == number
+    assert buffered < enqueue
@@ -2,6 +2,7 @@ import json
 import os
 
 import pytest
+from src.schemas.paket_record import PaketRecord
 from src.services.req_response import ResponseProcessor
 
 DATA_PATH = os.path.join(os.path.dirname(__file__), "HVCDATA.json")
@@ -19,7 +20,7 @@ def test_process_basic(sample_data):
     proc = ResponseProcessor()
     result = proc.process(paket_list)
     assert isinstance(result, list)
-    assert all(isinstance(p, dict) for p in result)
+    assert all(isinstance(p, PaketRecord) for p in result)
     # Check that quota is simplified (no leading "DATA National/Internet")
     for p in result:
         if p.get("quota"):